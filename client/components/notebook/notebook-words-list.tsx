@@ -31,7 +31,7 @@ export function NotebookWordsList() {
   const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [selectedLevel, setSelectedLevel] = useState<string>("all")
   const [searchTerm, setSearchTerm] = useState("")
-  const [page, setPage] = useState(1)
+  const [nextUrl, setNextUrl] = useState<string | null>(null)
   const [hasMore, setHasMore] = useState(true)
   const [totalWords, setTotalWords] = useState(0)
   const [levelCounts, setLevelCounts] = useState<Record<string, number>>({})
@@ -58,7 +58,8 @@ export function NotebookWordsList() {
   )
 
   // Function to fetch words with the given parameters
-  const fetchWords = async (pageNum: number, level: string, reset: boolean = false) => {
+  // The server paginates with a cursor: the first page is built here, later pages follow `next`
+  const fetchWords = async (level: string, reset: boolean = false) => {
     try {
       if (reset) {
         setIsLoading(true)
@@ -67,9 +68,12 @@ export function NotebookWordsList() {
       }
 
       // Build the API URL with query parameters
-      let url = `${ENDPOINTS.USER_WORDS.LEARNED_WORDS_PAGINATION}?page=${pageNum}&page_size=${pageSize}`
-      if (level !== "all") {
-        url += `&level=${level}`
+      let url = nextUrl
+      if (reset || !url) {
+        url = `${ENDPOINTS.USER_WORDS.LEARNED_WORDS_PAGINATION}?page_size=${pageSize}`
+        if (level !== "all") {
+          url += `&level=${level}`
+        }
       }
 
       const data = await apiGet<LearnedWordsPaginationResponse>(url)
@@ -86,6 +90,7 @@ export function NotebookWordsList() {
       }
 
       setTotalWords(data.count)
+      setNextUrl(data.next)
       setHasMore(data.next !== null)
       
       // Calculate level counts by analyzing the data
@@ -117,27 +122,24 @@ export function NotebookWordsList() {
 
   // Fetch initial data
   useEffect(() => {
-    fetchWords(1, selectedLevel, true)
+    fetchWords(selectedLevel, true)
   }, [])
 
   // Function to load more words (for infinite scrolling)
   const loadMoreWords = async () => {
     if (isLoadingMore || !hasMore) return
-    await fetchWords(page + 1, selectedLevel)
-    setPage(prev => prev + 1)
+    await fetchWords(selectedLevel)
   }
 
   // Handle level change
   const handleLevelChange = async (level: string) => {
     setSelectedLevel(level)
-    setPage(1)
-    await fetchWords(1, level, true)
+    await fetchWords(level, true)
   }
 
   // Handle refresh button
   const handleRefresh = async () => {
-    setPage(1)
-    await fetchWords(1, selectedLevel, true)
+    await fetchWords(selectedLevel, true)
   }
 
   // Filter words by search term
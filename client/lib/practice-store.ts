@@ -61,7 +61,7 @@ export const usePracticeStore = create<PracticeState>()(
 
         try {
           // Fetch real review words from API
-          const response = await fetchReviewWords()
+          const response = await fetchReviewWords(wordCount || undefined)
           const reviewWords = response.words || []
 
           // Limit to the requested word count
@@ -3,15 +3,28 @@ import { apiGet } from "@/lib/api-client";
 import { ENDPOINTS } from "@/lib/endpoint";
 import { Lesson } from "@/types/lessons";
 
+// Paginated lessons_by_course response (Django REST Framework page)
+type PaginatedLessonsResponse = {
+	count: number;
+	next: string | null;
+	previous: string | null;
+	results: Lesson[];
+};
+
+// Collects every page of the course's lessons by following `next`
 export const getLessonsByCourseId = async (
 	courseId: string | number
 ): Promise<Lesson[]> => {
 	try {
 		const courseIdStr = courseId.toString();
-		const response = await apiGet<Lesson[]>(
-			`${ENDPOINTS.LESSON.LESSONS_BY_COURSE(courseIdStr)}`
-		);
-		return response;
+		const lessons: Lesson[] = [];
+		let url: string | null = ENDPOINTS.LESSON.LESSONS_BY_COURSE(courseIdStr);
+		while (url) {
+			const page: PaginatedLessonsResponse = await apiGet<PaginatedLessonsResponse>(url);
+			lessons.push(...page.results);
+			url = page.next;
+		}
+		return lessons;
 	} catch (error) {
 		console.error("Failed to fetch lessons for course:", error);
 		throw error;
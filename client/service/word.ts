@@ -105,7 +105,26 @@ type ReviewWordResponse = {
 	}>;
 };
 
-// Function to fetch review words
-export const fetchReviewWords = async (): Promise<ReviewWordResponse> => {
-	return apiGet<ReviewWordResponse>(ENDPOINTS.USER_WORDS.REVIEW_WORDS);
+// One batch of review-words: the server returns at most 20 words per call
+// plus a session token to fetch the next batch while remaining > 0
+type ReviewWordBatch = Partial<ReviewWordResponse> & {
+	session?: string | null;
+	remaining?: number;
+};
+
+// Function to fetch review words, following the review session until it is
+// exhausted or `limit` words have been collected
+export const fetchReviewWords = async (limit?: number): Promise<ReviewWordResponse> => {
+	const words: ReviewWordResponse["words"] = [];
+	let session: string | null = null;
+
+	do {
+		const batch: ReviewWordBatch = await apiGet<ReviewWordBatch>(ENDPOINTS.USER_WORDS.REVIEW_WORDS, {
+			params: session ? { session } : undefined,
+		});
+		words.push(...(batch.words || []));
+		session = batch.remaining && batch.session ? batch.session : null;
+	} while (session && (limit === undefined || words.length < limit));
+
+	return { words: limit === undefined ? words : words.slice(0, limit) };
 };
@@ -44,6 +44,5 @@ export interface LearnedWord {
 export interface LearnedWordsPaginationResponse {
   count: number
   next: string | null
-  previous: string | null
   results: LearnedWord[]
 }
\ No newline at end of file
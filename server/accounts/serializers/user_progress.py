@@ -66,7 +66,10 @@ class UserCourseSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             total_lessons = obj.lesson_count
-            completed_lessons = UserLesson.objects.filter(user=request.user, lesson__course=obj).count()
+            # completed_lessons được annotate sẵn trong UserCourseViewSet.get_queryset
+            completed_lessons = getattr(obj, 'completed_lessons', None)
+            if completed_lessons is None:
+                completed_lessons = UserLesson.objects.filter(user=request.user, lesson__course=obj).count()
 
             if total_lessons > 0:
                 return (completed_lessons / total_lessons) * 100
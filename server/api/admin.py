@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Lesson, Word, Course, CustomUser, UserCourse, UserLesson, UserWord, LeaderBoard
+from .models import Lesson, Word, Course, CustomUser, UserCourse, UserLesson, UserWord, UserWordStats, LeaderBoard
 
 admin.site.register(Lesson)
 admin.site.register(Word)
@@ -8,4 +8,5 @@ admin.site.register(CustomUser)
 admin.site.register(UserCourse)
 admin.site.register(UserLesson)
 admin.site.register(UserWord)
+admin.site.register(UserWordStats)
 admin.site.register(LeaderBoard)
\ No newline at end of file
@@ -0,0 +1,90 @@
+import datetime
+import threading
+import zlib
+from decimal import Decimal
+
+import msgpack
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.base import BaseSerializer
+
+# Mã ext của msgpack cho các kiểu không có sẵn (lưu dạng chuỗi ISO / chuỗi số)
+EXT_DATETIME = 1
+EXT_DATE = 2
+EXT_DECIMAL = 3
+
+# Kích thước (byte) của giá trị vừa ghi/đọc trong thread hiện tại, dùng cho api.utils.cache_metrics
+_value_size = threading.local()
+
+
+def pop_value_size():
+    """Trả về và xóa kích thước giá trị đã mã hóa của thao tác cache gần nhất (0 nếu không có)."""
+    size = getattr(_value_size, "size", 0)
+    _value_size.size = 0
+    return size
+
+
+def _default(value):
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(value).encode())
+    raise TypeError(f"Không thể serialize kiểu {type(value).__name__} vào cache")
+
+
+def _ext_hook(code, data):
+    if code == EXT_DATETIME:
+        return datetime.datetime.fromisoformat(data.decode())
+    if code == EXT_DATE:
+        return datetime.date.fromisoformat(data.decode())
+    if code == EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class CompactMsgPackSerializer(BaseSerializer):
+    """
+    Serializer msgpack cho django-redis, hỗ trợ datetime (giữ timezone), date và Decimal.
+    Lưu ý: tuple được đọc lại thành list; giá trị không phải msgpack (ví dụ pickle cũ
+    trước khi đổi serializer) được coi như cache miss.
+    """
+
+    def dumps(self, value):
+        return msgpack.packb(value, default=_default, use_bin_type=True)
+
+    def loads(self, value):
+        try:
+            return msgpack.unpackb(value, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException):
+            return None
+
+
+class ThresholdZlibCompressor(BaseCompressor):
+    """
+    Chỉ nén giá trị lớn hơn COMPRESS_MIN_LENGTH byte và chỉ giữ bản nén nếu thực sự nhỏ hơn.
+    Giá trị không nén được client django-redis nhận ra qua CompressorError khi giải nén.
+
+    OPTIONS: COMPRESS_MIN_LENGTH (mặc định 1024), COMPRESS_LEVEL (mặc định 6)
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.min_length = int(options.get("COMPRESS_MIN_LENGTH", 1024))
+        self.level = int(options.get("COMPRESS_LEVEL", 6))
+
+    def compress(self, value):
+        if len(value) > self.min_length:
+            compressed = zlib.compress(value, self.level)
+            if len(compressed) < len(value):
+                value = compressed
+        _value_size.size = len(value)
+        return value
+
+    def decompress(self, value):
+        _value_size.size = len(value)
+        try:
+            return zlib.decompress(value)
+        except zlib.error as e:
+            raise CompressorError(e)
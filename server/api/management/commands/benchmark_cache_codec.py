@@ -0,0 +1,129 @@
+import pickle
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django_redis import get_redis_connection
+from django_redis.exceptions import CompressorError
+
+from accounts.models import CustomUser
+from api.cache_codec import CompactMsgPackSerializer, ThresholdZlibCompressor
+from api.models import Lesson, UserWord
+from api.serializers import WordSerializer
+from api.serializers.user_progress import LearnedWordsSerializer
+from api.utils.get_review_ready_words import get_review_ready_words
+
+
+class PickleCodec:
+    """Cấu hình mặc định của django-redis: pickle, không nén."""
+    name = "pickle"
+
+    def dumps(self, value):
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, value):
+        return pickle.loads(value)
+
+
+class CompactCodec:
+    name = "msgpack+zlib"
+
+    def __init__(self, options):
+        self.serializer = CompactMsgPackSerializer(options)
+        self.compressor = ThresholdZlibCompressor(options)
+
+    def dumps(self, value):
+        return self.compressor.compress(self.serializer.dumps(value))
+
+    def loads(self, value):
+        try:
+            value = self.compressor.decompress(value)
+        except CompressorError:
+            pass
+        return self.serializer.loads(value)
+
+
+class Command(BaseCommand):
+    help = (
+        "So sánh kích thước và độ trễ get/set của giá trị cache giữa pickle và msgpack+zlib "
+        "với payload thật (learned_words, count_words_by_level, danh sách từ của bài học). "
+        "Nếu cache mặc định là django-redis thì đo thêm MEMORY USAGE và độ trễ round trip tới Redis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, help="User dùng để dựng payload (mặc định: user đầu tiên có từ đã học).")
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--min-length', type=int, default=1024, help="COMPRESS_MIN_LENGTH cho msgpack+zlib.")
+
+    def _payloads(self, user):
+        cutoff_time, review_word_count = get_review_ready_words(user)
+        learned = {
+            "time_until_next_review": 0,
+            "review_word_count": review_word_count,
+            "level_counts": {},
+            "cutoff_time": cutoff_time,
+        }
+        for level in range(1, 6):
+            words = UserWord.objects.filter(user=user, level=level).select_related('word').order_by('id')[:10]
+            learned[f"words_level{level}"] = LearnedWordsSerializer(words, many=True).data
+            learned["level_counts"][f"count_level{level}"] = len(words)
+
+        count_words = {
+            "level_counts": learned["level_counts"],
+            "cefr_group_counts": {"basic": 10, "intermediate": 5, "advanced": 1},
+            "time_until_next_review": 0,
+            "review_word_count": review_word_count,
+            "cutoff_time": cutoff_time,
+        }
+        payloads = {"learned_words": learned, "count_words_by_level": count_words}
+        lesson = Lesson.objects.order_by('id').first()
+        if lesson is not None:
+            payloads["lesson_words"] = {
+                'data': WordSerializer(lesson.word_set.all(), many=True).data,
+                'delta': 0.01,
+                'expires_at': time.time(),
+            }
+        return payloads
+
+    def _time(self, func, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        if options['user_id']:
+            user = CustomUser.objects.filter(pk=options['user_id']).first()
+        else:
+            user = CustomUser.objects.filter(user_words__isnull=False).order_by('id').first()
+        if user is None:
+            raise CommandError("Không tìm thấy user có từ đã học để dựng payload.")
+
+        redis = None
+        try:
+            redis = get_redis_connection("default")
+        except NotImplementedError:
+            self.stdout.write("Cache mặc định không phải django-redis: chỉ đo codec.")
+
+        iterations = options['iterations']
+        codecs = [PickleCodec(), CompactCodec({"COMPRESS_MIN_LENGTH": options['min_length']})]
+        self.stdout.write(f"Thời điểm đo: {timezone.now():%Y-%m-%d %H:%M}, {iterations} lần lặp")
+        for payload_name, payload in self._payloads(user).items():
+            self.stdout.write(self.style.MIGRATE_HEADING(payload_name))
+            for codec in codecs:
+                encoded = codec.dumps(payload)
+                line = (
+                    f"  {codec.name:<13} {len(encoded):>8} byte  "
+                    f"dumps {self._time(lambda: codec.dumps(payload), iterations):8.1f} µs  "
+                    f"loads {self._time(lambda: codec.loads(encoded), iterations):8.1f} µs"
+                )
+                if redis is not None:
+                    key = f"benchmark_cache_codec:{payload_name}:{codec.name}"
+                    set_us = self._time(lambda: redis.set(key, codec.dumps(payload)), iterations)
+                    get_us = self._time(lambda: codec.loads(redis.get(key)), iterations)
+                    line += (
+                        f"  redis {redis.memory_usage(key):>8} byte  "
+                        f"set {set_us:8.1f} µs  get {get_us:8.1f} µs"
+                    )
+                    redis.delete(key)
+                self.stdout.write(line)
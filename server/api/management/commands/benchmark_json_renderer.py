@@ -0,0 +1,80 @@
+import statistics
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api.models import Lesson, UserWord
+from api.renderers import FastJSONRenderer
+from api.serializers import UserWordOutputSerializer, WordSerializer
+from api.serializers.fast import fast_serialize
+from api.views import LessonViewSet, lesson_views
+
+
+def _percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "So sánh JSONRenderer của DRF với api.renderers.FastJSONRenderer trên payload lớn nhất "
+        "(bài học nhiều từ nhất, danh sách từ đã học của user nhiều từ nhất): thời gian encode "
+        "và độ trễ p50/p99 của GET /api/lessons/<id>/words/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--user-words', type=int, default=2000, help="Số UserWord tối đa trong payload thứ hai.")
+
+    def _report(self, label, samples):
+        self.stdout.write(
+            f"  {label:<18} mean {statistics.fmean(samples):8.2f} ms  "
+            f"p50 {_percentile(samples, 50):8.2f} ms  p99 {_percentile(samples, 99):8.2f} ms"
+        )
+
+    def handle(self, *args, **options):
+        lesson = Lesson.objects.annotate(n=Count('word')).order_by('-n', 'id').first()
+        if lesson is None:
+            raise CommandError("Chưa có bài học nào để dựng payload.")
+        iterations = options['iterations']
+
+        payloads = {f"lesson {lesson.id} ({lesson.n} từ)": fast_serialize(WordSerializer, lesson.word_set.all())}
+        user_id = (
+            UserWord.objects.values('user').annotate(n=Count('id')).order_by('-n').values_list('user', flat=True).first()
+        )
+        if user_id is not None:
+            user_words = UserWord.objects.filter(user_id=user_id).select_related('word')[:options['user_words']]
+            payloads[f"user {user_id} words"] = fast_serialize(UserWordOutputSerializer, user_words)
+
+        renderers = (("DRF JSONRenderer", JSONRenderer()), ("FastJSONRenderer", FastJSONRenderer()))
+        for name, payload in payloads.items():
+            expected = JSONRenderer().render(payload)
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"encode {name}: {len(expected)} byte, "
+                f"{'khớp' if FastJSONRenderer().render(payload) == expected else 'KHÁC'} byte với DRF"
+            ))
+            for label, renderer in renderers:
+                samples = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    renderer.render(payload)
+                    samples.append((time.perf_counter() - started) * 1000)
+                self._report(label, samples)
+
+        # Đo toàn bộ request (view + render), bỏ qua snapshot để luôn đi qua renderer
+        factory = APIRequestFactory()
+        self.stdout.write(self.style.MIGRATE_HEADING(f"GET /api/lessons/{lesson.id}/words/"))
+        with mock.patch.object(lesson_views, 'get_snapshot_fragment', return_value=None):
+            for label, renderer in renderers:
+                view = LessonViewSet.as_view({'get': 'get_words'}, renderer_classes=[type(renderer)])
+                samples = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    response = view(factory.get(f"/api/lessons/{lesson.id}/words/"), pk=lesson.id)
+                    response.render()
+                    samples.append((time.perf_counter() - started) * 1000)
+                self._report(label, samples)
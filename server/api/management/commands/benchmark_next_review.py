@@ -0,0 +1,47 @@
+import time
+from datetime import timedelta
+from random import Random, randint
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.utils.calculate_next_review import calculate_next_reviews, level_time, question_type_times
+
+
+def per_word_next_review(level, streak, question_type):
+    """Cách tính cũ: mỗi từ gọi timezone.now(), randint và tạo timedelta riêng."""
+    base_hours = streak * question_type_times[question_type] * level_time[level - 1]
+    return timezone.now() + timedelta(hours=base_hours, minutes=randint(0, 59))
+
+
+class Command(BaseCommand):
+    help = (
+        "Đo thời gian lập lịch next_review cho 10, 1.000 và 1.000.000 từ: "
+        "gọi từng từ (cách cũ) so với calculate_next_reviews (một mốc now, một RNG, bảng tra timedelta)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 1000000])
+        parser.add_argument('--seed', type=int, default=0)
+
+    def _time(self, func, size):
+        # Batch nhỏ được lặp nhiều lần để kết quả ổn định
+        rounds = max(1, 100000 // size)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return (time.perf_counter() - started) / rounds * 1000
+
+    def handle(self, *args, **options):
+        rng = Random(options['seed'])
+        question_types = list(question_type_times)
+        for size in options['sizes']:
+            levels = [rng.randint(1, 5) for _ in range(size)]
+            streaks = [rng.randint(1, 10) for _ in range(size)]
+            types = [rng.choice(question_types) for _ in range(size)]
+
+            loop_ms = self._time(lambda: [per_word_next_review(*args) for args in zip(levels, streaks, types)], size)
+            batch_ms = self._time(lambda: calculate_next_reviews(levels, streaks, types, rng=rng), size)
+            self.stdout.write(
+                f"n={size:<10,} từng từ {loop_ms:12.3f} ms  batch {batch_ms:12.3f} ms  (x{loop_ms / batch_ms:.1f})"
+            )
@@ -0,0 +1,82 @@
+import time
+from datetime import timedelta
+
+from cloudinary.models import CloudinaryField
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.models import UserWord, Word
+from api.serializers import UserWordOutputSerializer, WordSerializer
+from api.serializers.fast import fast_serialize
+from api.serializers.user_progress import LearnedWordsSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Kiểm tra api.serializers.fast cho ra đúng JSON của WordSerializer, UserWordOutputSerializer "
+        "và LearnedWordsSerializer (báo lỗi nếu khác), rồi so sánh số dòng/giây với serializer DRF."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--rounds', type=int, default=20)
+
+    def _rows(self, count):
+        image_field, audio_field = CloudinaryField('image'), CloudinaryField('audio')
+        now = timezone.now()
+        words, user_words = [], []
+        for i in range(count):
+            word = Word(
+                id=i + 1,
+                word=f"word{i}",
+                pronunciation=f"/wɜːd{i}/",
+                pos="noun",
+                meaning=f"nghĩa {i}",
+                example=None if i % 3 else f"Example {i}.",
+                example_vi=None,
+                # Một phần từ không có ảnh/âm thanh để kiểm tra nhánh None
+                image=image_field.to_python(f"image/upload/v1712000000/words/word{i}.jpg") if i % 4 else None,
+                audio=audio_field.to_python(f"video/upload/v1712000000/words/word{i}.mp3") if i % 5 else None,
+                cefr="B1",
+            )
+            words.append(word)
+            user_words.append(UserWord(
+                id=i + 1,
+                user_id=1,
+                word=word,
+                level=i % 5 + 1,
+                streak=i % 10 + 1,
+                next_review=now + timedelta(hours=i, microseconds=i),
+                last_review=now,
+                learned_at=now - timedelta(days=i),
+            ))
+        return words, user_words
+
+    def _rows_per_second(self, func, rows, rounds):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return rows * rounds / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        words, user_words = self._rows(options['rows'])
+        rounds = options['rounds']
+        renderer = JSONRenderer()
+        cases = (
+            (WordSerializer, words),
+            (UserWordOutputSerializer, user_words),
+            (LearnedWordsSerializer, user_words),
+        )
+        for serializer_class, instances in cases:
+            expected = renderer.render(serializer_class(instances, many=True).data)
+            actual = renderer.render(fast_serialize(serializer_class, instances))
+            if expected != actual:
+                raise CommandError(f"{serializer_class.__name__}: JSON của api.serializers.fast khác serializer DRF.")
+
+            drf = self._rows_per_second(lambda: serializer_class(instances, many=True).data, len(instances), rounds)
+            fast = self._rows_per_second(lambda: fast_serialize(serializer_class, instances), len(instances), rounds)
+            self.stdout.write(
+                f"{serializer_class.__name__:<26} khớp JSON  DRF {drf:>9.0f} dòng/s  fast {fast:>9.0f} dòng/s  "
+                f"(x{fast / drf:.1f})"
+            )
@@ -0,0 +1,113 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import CustomUser
+from api.models import Lesson, UserWord, Word
+from api.serializers import UserWordOutputSerializer
+from api.utils.stream_json import stream_json
+
+BENCHMARK_USERNAME = "benchmark_stream_export"
+
+
+def _peak_rss_kb():
+    # ru_maxrss tính bằng KB trên Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Command(BaseCommand):
+    help = (
+        "So sánh peak RSS khi xuất toàn bộ từ đã học của một user (mặc định 50.000 từ): "
+        "serialize + render cả danh sách (cách cũ của get-words) so với stream_json. "
+        "Mỗi chế độ chạy trong một process riêng để peak RSS không ảnh hưởng lẫn nhau. "
+        "Dữ liệu tạm được tạo trong một transaction bị rollback khi đo xong, không để lại gì "
+        "trong database và không làm đổi catalog (version, snapshot)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=50000, help="Số từ tạo tạm cho user benchmark.")
+        parser.add_argument('--user-id', type=int, help="Dùng từ đã học của user này thay vì tạo dữ liệu tạm.")
+        parser.add_argument('--mode', choices=['buffered', 'stream'], help=
+                            "Chỉ chạy một chế độ trong process hiện tại (dùng nội bộ), in kết quả dạng JSON.")
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            with transaction.atomic():
+                user_id = options['user_id']
+                if user_id is None:
+                    user_id = self._seed(options['words'])
+                self._measure(user_id, options['mode'])
+                # Bỏ toàn bộ dữ liệu tạm; on_commit (bump catalog version) cũng bị hủy theo
+                transaction.set_rollback(True)
+            return
+
+        source = ['--user-id', str(options['user_id'])] if options['user_id'] else ['--words', str(options['words'])]
+        for mode in ('buffered', 'stream'):
+            output = subprocess.run(
+                [sys.executable, sys.argv[0], 'benchmark_stream_export', '--mode', mode, *source],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            self.stdout.write(
+                f"{mode:<9} {result['rows']:>7} dòng  body {result['body_bytes'] / 2**20:7.1f} MB  "
+                f"peak RSS {result['peak_rss_kb'] / 1024:7.1f} MB "
+                f"(+{(result['peak_rss_kb'] - result['baseline_rss_kb']) / 1024:.1f} MB)  {result['seconds']:.2f} s"
+            )
+
+    def _measure(self, user_id, mode):
+        queryset = UserWord.objects.filter(user_id=user_id).select_related('word').order_by('level', 'id')
+        baseline = _peak_rss_kb()
+        started = time.perf_counter()
+        if mode == 'buffered':
+            rows = list(queryset)
+            body_bytes = len(JSONRenderer().render(UserWordOutputSerializer(rows, many=True).data))
+            rows = len(rows)
+        else:
+            rows = body_bytes = 0
+            for chunk in stream_json(queryset, UserWordOutputSerializer):
+                body_bytes += len(chunk)
+                rows += 1
+            rows -= 2  # "[" và "]"
+        self.stdout.write(json.dumps({
+            'rows': rows,
+            'body_bytes': body_bytes,
+            'baseline_rss_kb': baseline,
+            'peak_rss_kb': _peak_rss_kb(),
+            'seconds': time.perf_counter() - started,
+        }))
+
+    def _seed(self, count):
+        """
+        Tạo user, bài học và count từ đã học bằng INSERT ... SELECT generate_series:
+        không dựng object Python nên không làm tăng peak RSS trước khi đo.
+        """
+        user = CustomUser.objects.create(username=BENCHMARK_USERNAME, verification_token=None)
+        lesson = Lesson.objects.create(title=BENCHMARK_USERNAME)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Word._meta.db_table}
+                    (lesson_id, word, pronunciation, pos, meaning, example, example_vi, cefr, created_at, updated_at)
+                SELECT %s, 'word' || i, '/ˈwɜːd/', 'noun', 'nghĩa của từ ' || i,
+                       'This is a typical example sentence for the word.',
+                       'Đây là một câu ví dụ điển hình cho từ này.', 'B1', now(), now()
+                FROM generate_series(0, %s - 1) AS i
+                """,
+                [lesson.id, count],
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {UserWord._meta.db_table}
+                    (user_id, word_id, level, next_review, last_review, streak, learned_at)
+                SELECT %s, id, (row_number() OVER (ORDER BY id) - 1) %% 5 + 1, now(), now(), 1, now()
+                FROM {Word._meta.db_table} WHERE lesson_id = %s
+                """,
+                [user.id, lesson.id],
+            )
+        return user.id
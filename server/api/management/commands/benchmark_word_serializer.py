@@ -0,0 +1,59 @@
+import cProfile
+import pstats
+import time
+
+from cloudinary.models import CloudinaryField
+from django.core.management.base import BaseCommand
+
+from api.models import Word
+from api.serializers import WordSerializer
+from api.utils.cloudinary_url import clear_cloudinary_url_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Đo chi phí serialize mỗi dòng của WordSerializer trên một bài học giả lập (mặc định 1.000 từ, "
+        "đều có image và audio), khi phải dựng URL Cloudinary cho mọi dòng (cache URL rỗng) "
+        "so với khi URL đã được cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=1000)
+        parser.add_argument('--rounds', type=int, default=20)
+        parser.add_argument('--profile', action='store_true', help="In 15 hàm tốn thời gian nhất (cProfile) của mỗi chế độ.")
+
+    def _words(self, count):
+        # Giống giá trị from_db_value trả về khi đọc từ DB
+        image_field, audio_field = CloudinaryField('image'), CloudinaryField('audio')
+        return [
+            Word(
+                id=i,
+                word=f"word{i}",
+                meaning=f"nghĩa {i}",
+                image=image_field.to_python(f"image/upload/v1712000000/words/word{i}.jpg"),
+                audio=audio_field.to_python(f"video/upload/v1712000000/words/word{i}.mp3"),
+                cefr="A1",
+            )
+            for i in range(count)
+        ]
+
+    def _run(self, words, rounds, cold):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            if cold:
+                clear_cloudinary_url_cache()
+            WordSerializer(words, many=True).data
+        return (time.perf_counter() - started) / (rounds * len(words)) * 1e6
+
+    def handle(self, *args, **options):
+        words = self._words(options['words'])
+        rounds = options['rounds']
+        self._run(words, 1, cold=False)  # Làm nóng
+
+        for label, cold in (("dựng URL mỗi dòng", True), ("URL đã cache", False)):
+            per_row = self._run(words, rounds, cold)
+            self.stdout.write(f"{label:<20} {per_row:8.2f} µs/dòng")
+            if options['profile']:
+                profiler = cProfile.Profile()
+                profiler.runcall(self._run, words, 1, cold)
+                pstats.Stats(profiler, stream=self.stdout).sort_stats('cumulative').print_stats(15)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.cache_lock import acquire_cache_lock, release_cache_lock
+from api.utils.catalog_cache import get_catalog_version
+from api.utils.catalog_snapshot import REBUILD_LOCK_KEY, REBUILD_LOCK_TIMEOUT, build_catalog_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialize sẵn danh sách từ của mọi bài học thành một file snapshot nhị phân "
+        "để các worker mmap và trả response mà không cần ORM/serializer. "
+        "Chạy khi deploy (hoặc cron) để tạo snapshot; sau đó được tự chạy lại khi catalog đổi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help="Đường dẫn file snapshot (mặc định: settings.CATALOG_SNAPSHOT_PATH).")
+        parser.add_argument('--lock-token', help="Token của khóa rebuild do worker giữ, được nhả khi build xong (dùng nội bộ).")
+
+    def handle(self, *args, **options):
+        token = options['lock_token']
+        while True:
+            try:
+                version, fragment_count, size = build_catalog_snapshot(options['path'])
+            finally:
+                if token:
+                    release_cache_lock(REBUILD_LOCK_KEY, token)
+            self.stdout.write(self.style.SUCCESS(
+                f"Đã ghi snapshot version {version}: {fragment_count} fragment, {size} byte."
+            ))
+            # Chạy từ schedule_catalog_snapshot_rebuild: catalog đổi trong lúc build thì lần lên lịch
+            # đó đã bị khóa chặn, nên build lại. Kiểm tra sau khi nhả khóa để thay đổi đến sau đó
+            # tự lên lịch được; nếu process khác đã lấy khóa thì để nó build.
+            if not token or get_catalog_version() == version:
+                return
+            token = acquire_cache_lock(REBUILD_LOCK_KEY, REBUILD_LOCK_TIMEOUT)
+            if token is None:
+                return
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import CustomUser
+from api.utils.user_word_stats import build_user_word_stats, reset_user_word_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Tính lại UserWordStats (số từ theo level và nhóm CEFR) từ bảng UserWord, "
+        "dùng khi bộ đếm bị lệch (ví dụ sau khi sửa dữ liệu trực tiếp trong DB)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, nargs='*', help="Chỉ tính lại cho các user này (mặc định: mọi user có từ đã học).")
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.order_by('id')
+        if options['user_id']:
+            users = users.filter(id__in=options['user_id'])
+        else:
+            users = users.filter(user_words__isnull=False).distinct()
+
+        count = 0
+        for user in users.iterator():
+            # DELETE giữ khóa dòng thống kê tới khi tạo lại xong: submit_words đang chạy
+            # (lock_user_word_stats) commit trước, hoặc chờ và cộng delta lên bản ghi mới
+            with transaction.atomic():
+                reset_user_word_stats([user.id])
+                build_user_word_stats(user)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Đã tính lại bộ đếm của {count} user."))
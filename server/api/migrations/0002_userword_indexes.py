@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:08
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY không chạy được bên trong transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='leaderboard',
+            index=models.Index(fields=['-total_score'], name='leaderboard_total_score_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userword',
+            index=models.Index(fields=['user', 'next_review'], name='userword_user_next_review_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='userword',
+            index=models.Index(fields=['user', 'level', 'id'], name='userword_user_level_id_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_userword_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserWordStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count_level1', models.PositiveIntegerField(default=0)),
+                ('count_level2', models.PositiveIntegerField(default=0)),
+                ('count_level3', models.PositiveIntegerField(default=0)),
+                ('count_level4', models.PositiveIntegerField(default=0)),
+                ('count_level5', models.PositiveIntegerField(default=0)),
+                ('basic', models.PositiveIntegerField(default=0)),
+                ('intermediate', models.PositiveIntegerField(default=0)),
+                ('advanced', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='word_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
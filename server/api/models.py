@@ -93,11 +93,37 @@ class UserWord(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'word'], name='unique_user_word')
         ]
+        indexes = [
+            # Cửa sổ ôn tập: lọc theo user và next_review
+            models.Index(fields=['user', 'next_review'], name='userword_user_next_review_idx'),
+            # Danh sách từ theo level: lọc theo user, level và sắp xếp theo id
+            models.Index(fields=['user', 'level', 'id'], name='userword_user_level_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.word.word} (Level: {self.level})"
 
 
+class UserWordStats(models.Model):
+    """
+    Số từ của user theo từng level và nhóm CEFR, được submit_words cập nhật
+    bằng phép cộng/trừ delta thay vì GROUP BY toàn bộ UserWord mỗi lần đọc.
+    """
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='word_stats')
+    count_level1 = models.PositiveIntegerField(default=0)
+    count_level2 = models.PositiveIntegerField(default=0)
+    count_level3 = models.PositiveIntegerField(default=0)
+    count_level4 = models.PositiveIntegerField(default=0)
+    count_level5 = models.PositiveIntegerField(default=0)
+    basic = models.PositiveIntegerField(default=0)  # A1, A2
+    intermediate = models.PositiveIntegerField(default=0)  # B1, B2
+    advanced = models.PositiveIntegerField(default=0)  # C1, C2
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - word stats"
+
+
 class LeaderBoard(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     total_score = models.IntegerField(default=0)  # Điểm số tổng hợp từ các bài học
@@ -105,6 +131,9 @@ class LeaderBoard(models.Model):
 
     class Meta:
         ordering = ['-total_score']
+        indexes = [
+            models.Index(fields=['-total_score'], name='leaderboard_total_score_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.total_score}"
\ No newline at end of file
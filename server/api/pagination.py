@@ -1,14 +1,96 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 class CustomPagination(PageNumberPagination):
     page_size = 9
     page_size_query_param = 'page_size'
     max_page_size = 20
 
-class LearnedWordsPagination(PageNumberPagination):
-    page_size = 2  
-    page_size_query_param = 'page_size'  
-    max_page_size = 50
+class LearnedWordsPagination(BasePagination):
+    """
+    Phân trang keyset (cursor) theo (level, id) cho UserWord: mỗi trang chỉ đọc
+    page_size + 1 dòng qua index (user, level, id), không OFFSET, nên trang sâu
+    tốn chi phí như trang đầu.
+
+    Response: {"count": <tổng số dòng>, "next": <url trang sau | null>, "results": [...]}.
+    Client đi theo link "next" (chứa ?cursor=), tham số ?page= không được dùng.
+    count nên được truyền vào từ bộ đếm có sẵn (UserWordStats); nếu không có thì chạy COUNT(*).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.request = request
+        self.count = queryset.count() if count is None else count
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by('level', 'id')
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            level, pk = position
+            # level >= giá trị cursor giúp Postgres dùng index làm điều kiện quét
+            queryset = queryset.filter(level__gte=level).filter(Q(level__gt=level) | Q(id__gt=pk))
+
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        self.next_position = (results[-1].level, results[-1].id) if self.has_next else None
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            level, pk = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('.')
+            return int(level), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            # Cursor hỏng là lỗi dữ liệu đầu vào của client (400), không phải tài nguyên không tồn tại
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+    def encode_cursor(self, position):
+        return urlsafe_b64encode(f"{position[0]}.{position[1]}".encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['count', 'results'],
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
 
 class LeaderBoardPagination(PageNumberPagination):
     page_size = 10
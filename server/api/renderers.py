@@ -0,0 +1,44 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Không có orjson: dùng JSONRenderer của DRF (json chuẩn)
+    orjson = None
+
+# Các kiểu orjson không hỗ trợ sẵn (Decimal, timedelta, lazy string, QuerySet, ...)
+# được chuyển đổi giống hệt JSONEncoder của DRF
+_drf_default = JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer dùng orjson (nhanh hơn nhiều với danh sách từ/bài học lớn), cho ra cùng JSON
+    với renderer mặc định của DRF: datetime UTC kết thúc bằng "Z", UUID và Decimal như
+    JSONEncoder của DRF, escape U+2028/U+2029.
+    Dùng lại json chuẩn khi thiếu orjson, khi client yêu cầu indent, khi
+    UNICODE_JSON=False hoặc khi orjson không encode được (ví dụ số nguyên > 64 bit).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or not api_settings.UNICODE_JSON
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_drf_default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Giống DRF: U+2028/U+2029 hợp lệ trong JSON nhưng không hợp lệ trong JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
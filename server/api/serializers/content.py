@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from ..models import Word, Lesson, Course, LeaderBoard
+from ..utils.cloudinary_url import cloudinary_url
+from .sparse import SparseFieldsMixin
 
 
-class WordSerializer(serializers.ModelSerializer):
+class WordSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
     audio = serializers.SerializerMethodField()
 
@@ -11,13 +13,17 @@ class WordSerializer(serializers.ModelSerializer):
         fields = ['id', 'word', 'pronunciation', 'pos', 'meaning', 'example', 'example_vi', 'image', 'audio', 'cefr']
 
     def get_image(self, obj):
-        return obj.image.url if obj.image else None
+        return cloudinary_url(obj.image)
 
     def get_audio(self, obj):
-        return obj.audio.url if obj.audio else None
+        return cloudinary_url(obj.audio)
 
 
 class LessonSerializer(serializers.ModelSerializer):
+    """
+    Bài học kèm danh sách từ; context['include_words'] = False để bỏ words (bản rút gọn).
+    Khi kèm words, queryset nên prefetch_related('word_set') để tránh một truy vấn mỗi bài học.
+    """
     words = WordSerializer(many=True, read_only=True, source='word_set')  # Lấy danh sách Word của Lesson
     image = serializers.SerializerMethodField()
 
@@ -25,8 +31,14 @@ class LessonSerializer(serializers.ModelSerializer):
         model = Lesson
         fields = '__all__' 
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get('include_words', True):
+            fields.pop('words')
+        return fields
+
     def get_image(self, obj):
-        return obj.image.url if obj.image else None
+        return cloudinary_url(obj.image)
 
 
 class OnlyLessonSerializer(serializers.ModelSerializer):
@@ -38,7 +50,7 @@ class OnlyLessonSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'image', 'word_count']
 
     def get_image(self, obj):
-        return obj.image.url if obj.image else None
+        return cloudinary_url(obj.image)
 
 
 class CourseSerializer(serializers.ModelSerializer):
@@ -49,7 +61,7 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_image(self, obj):
-        return obj.image.url if obj.image else None
+        return cloudinary_url(obj.image)
 
 class LeaderBoardSerializer(serializers.ModelSerializer):
     """
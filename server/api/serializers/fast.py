@@ -0,0 +1,107 @@
+from functools import lru_cache
+from operator import attrgetter
+
+from django.conf import settings
+from django.db.models.manager import BaseManager
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from api.serializers.sparse import NO_SPARSE_FIELDS
+
+# Các field có to_representation chỉ ép kiểu (int(), str(), bool()) trên giá trị đã đúng kiểu từ DB
+_PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.FloatField,
+)
+
+
+def _datetime_accessor(field, getter):
+    """
+    Giống DateTimeField.to_representation với định dạng ISO 8601, nhưng múi giờ hiện tại
+    được đọc một lần cho cả batch (tz) thay vì mỗi giá trị.
+    """
+    def accessor(obj, tz):
+        value = getter(obj)
+        if not value:
+            return None
+        if tz is None or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return accessor
+
+
+def _compile_field(name, field, template, sparse):
+    """
+    Trả về (hàm lấy giá trị JSON của field, hàm có nhận tz hay không),
+    tương đương field.to_representation(field.get_attribute(obj)).
+    """
+    if isinstance(field, serializers.SerializerMethodField):
+        return getattr(template, field.method_name), False
+    if isinstance(field, serializers.ListSerializer):
+        nested = compile_serializer(type(field.child), sparse.nested(name))
+        getter = attrgetter(field.source)
+
+        def many(obj, tz):
+            items = getter(obj)
+            if isinstance(items, BaseManager):
+                items = items.all()
+            return [nested(item, tz) for item in items]
+        return many, True
+    if isinstance(field, serializers.BaseSerializer):
+        nested = compile_serializer(type(field), sparse.nested(name))
+        getter = attrgetter(field.source)
+        return (lambda obj, tz: None if (value := getter(obj)) is None else nested(value, tz)), True
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return attrgetter(f"{field.source}_id"), False
+    getter = attrgetter(field.source)
+    if type(field) in _PASSTHROUGH_FIELDS:
+        return getter, False
+    if (
+        type(field) is serializers.DateTimeField
+        and not hasattr(field, 'timezone')
+        and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+    ):
+        return _datetime_accessor(field, getter), True
+    to_representation = field.to_representation
+    return (lambda obj: None if (value := getter(obj)) is None else to_representation(value)), False
+
+
+@lru_cache(maxsize=256)
+def compile_serializer(serializer_class, sparse=NO_SPARSE_FIELDS):
+    """
+    Dịch một ModelSerializer chỉ-đọc thành hàm (obj, tz) -> dict với cùng field, cùng thứ tự
+    và cùng định dạng giá trị (datetime, SerializerMethodField, serializer lồng nhau),
+    nhưng bỏ qua vòng lặp field / to_representation của DRF cho mỗi dòng.
+    Field được lấy một lần từ serializer mẫu nên tự theo kịp khi Meta.fields thay đổi.
+    sparse: tập field được chọn (api.serializers.sparse.SparseFields) nếu serializer hỗ trợ.
+    """
+    template = serializer_class(context={'sparse_fields': sparse})
+    accessors = tuple(
+        (name, *_compile_field(name, field, template, sparse))
+        for name, field in template.fields.items()
+        if not field.write_only
+    )
+
+    def to_dict(obj, tz):
+        return {
+            name: accessor(obj, tz) if takes_tz else accessor(obj)
+            for name, accessor, takes_tz in accessors
+        }
+
+    return to_dict
+
+
+def fast_serialize(serializer_class, instances, sparse=NO_SPARSE_FIELDS):
+    """
+    Tương đương serializer_class(instances, many=True, context={'sparse_fields': sparse}).data
+    (dạng list dict) cho đường đọc nóng.
+    """
+    to_dict = compile_serializer(serializer_class, sparse)
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    return [to_dict(instance, tz) for instance in instances]
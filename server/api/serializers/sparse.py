@@ -0,0 +1,138 @@
+from collections import namedtuple
+
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+# Luôn trả về id để client vẫn định danh được từng dòng
+ALWAYS_INCLUDED = frozenset({'id'})
+
+
+class SparseFields(namedtuple('SparseFields', ['fields', 'omit'])):
+    """
+    Tập field được chọn qua ?fields= / ?omit=, đường dẫn lồng nhau dùng dấu chấm
+    (ví dụ ?fields=level,word.word,word.meaning cho UserWord).
+
+    fields: frozenset đường dẫn cần giữ, None nếu giữ tất cả
+    omit: frozenset đường dẫn cần bỏ
+    """
+
+    def __bool__(self):
+        return self.fields is not None or bool(self.omit)
+
+    def keep(self, name):
+        if name in ALWAYS_INCLUDED:
+            return True
+        if name in self.omit:
+            return False
+        if self.fields is None:
+            return True
+        prefix = name + '.'
+        return name in self.fields or any(path.startswith(prefix) for path in self.fields)
+
+    def nested(self, name):
+        """Tập field áp dụng cho serializer lồng nhau tại field name."""
+        prefix = name + '.'
+        if self.fields is None or name in self.fields:
+            fields = None
+        else:
+            fields = frozenset(path[len(prefix):] for path in self.fields if path.startswith(prefix))
+        omit = frozenset(path[len(prefix):] for path in self.omit if path.startswith(prefix))
+        return SparseFields(fields, omit)
+
+    def cache_key(self):
+        """Chuỗi ổn định để đưa vào khóa cache, rỗng nếu không chọn field."""
+        if not self:
+            return ""
+        fields = "*" if self.fields is None else ",".join(sorted(self.fields))
+        return f"fields={fields};omit={','.join(sorted(self.omit))}"
+
+
+NO_SPARSE_FIELDS = SparseFields(None, frozenset())
+
+
+def _known_paths(serializer_class, prefix=""):
+    paths = set()
+    for name, field in serializer_class().fields.items():
+        paths.add(prefix + name)
+        if isinstance(field, serializers.BaseSerializer) and not isinstance(field, serializers.ListSerializer):
+            paths |= _known_paths(type(field), f"{prefix}{name}.")
+    return paths
+
+
+def parse_sparse_fields(request, serializer_class):
+    """
+    Đọc ?fields= và ?omit= (phân tách bằng dấu phẩy), bỏ các đường dẫn không tồn tại
+    trong serializer_class để khóa cache không phụ thuộc vào tham số rác.
+    """
+    known = _known_paths(serializer_class)
+
+    def read(param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return frozenset(path for path in (part.strip() for part in value.split(',')) if path in known)
+
+    return SparseFields(read(FIELDS_PARAM), read(OMIT_PARAM) or frozenset())
+
+
+class SparseFieldsMixin:
+    """
+    Chỉ giữ các field được chọn qua context['sparse_fields'] (SparseFields).
+    Serializer lồng nhau tự lấy phần tương ứng theo tên field của nó trong serializer cha.
+    """
+
+    def _sparse_fields(self):
+        sparse = self.context.get('sparse_fields') or NO_SPARSE_FIELDS
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        for name in reversed(path):
+            sparse = sparse.nested(name)
+        return sparse
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse = self._sparse_fields()
+        if not sparse:
+            return fields
+        return {name: field for name, field in fields.items() if sparse.keep(name)}
+
+
+def _columns(serializer_class, sparse, prefix=""):
+    concrete_fields = serializer_class.Meta.model._meta.concrete_fields
+    model_fields = {field.name for field in concrete_fields}
+    # Luôn đọc khóa ngoại (chỉ là số nguyên): Django cần chúng khi dựng object từ related manager
+    # (lesson.word_set) hoặc select_related, thiếu sẽ phát sinh một truy vấn cho mỗi dòng
+    columns = [prefix + field.name for field in concrete_fields if field.is_relation]
+    for name, field in serializer_class(context={'sparse_fields': sparse}).fields.items():
+        if isinstance(field, serializers.ListSerializer):
+            continue
+        # SerializerMethodField (image, audio) đọc field model cùng tên
+        source = name if isinstance(field, serializers.SerializerMethodField) else field.source
+        if isinstance(field, serializers.BaseSerializer):
+            columns += _columns(type(field), sparse.nested(name), f"{prefix}{source}__")
+        elif source in model_fields and prefix + source not in columns:
+            columns.append(prefix + source)
+    return columns
+
+
+def sparse_only(queryset, serializer_class, sparse, extra_columns=()):
+    """
+    Áp .only() với đúng các cột serializer_class cần cho tập field đã chọn, để Postgres
+    không phải đọc (và API không phải encode) các cột không dùng.
+    select_related tới quan hệ bị loại cũng được bỏ. extra_columns: cột cần thêm (ví dụ cột sắp xếp).
+    """
+    if not sparse:
+        return queryset
+    columns = _columns(serializer_class, sparse) + list(extra_columns)
+    related = queryset.query.select_related
+    if isinstance(related, dict):
+        kept = [name for name in related if any(column.startswith(name + '__') for column in columns)]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+    return queryset.only(*columns)
@@ -4,6 +4,8 @@ from . import WordSerializer
 from ..models import Lesson, Course, UserCourse, UserLesson, UserWord
 from ..models import Word
 from ..models import Lesson
+from ..utils.cloudinary_url import cloudinary_url
+from .sparse import SparseFieldsMixin
 
 
 class UserLessonSerializer(serializers.ModelSerializer):
@@ -25,9 +27,12 @@ class UserLessonSerializer(serializers.ModelSerializer):
         ]
 
     def get_image(self, obj):
-        return obj.image.url if obj.image else None
+        return cloudinary_url(obj.image)
 
     def get_is_learned(self, obj):
+        # Ưu tiên giá trị annotate sẵn (api.utils.annotate_is_learned), tránh N+1 truy vấn
+        if hasattr(obj, 'is_learned'):
+            return obj.is_learned
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             # Kiểm tra nếu có bản ghi UserLesson cho user và lesson này
@@ -60,13 +65,16 @@ class UserCourseSerializer(serializers.ModelSerializer):
         ]
 
     def get_image(self, obj):
-        return obj.image.url if obj.image else None
+        return cloudinary_url(obj.image)
 
     def get_progress(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             total_lessons = obj.lesson_count
-            completed_lessons = UserLesson.objects.filter(user=request.user, lesson__course=obj).count()
+            # completed_lessons được annotate sẵn trong UserCourseViewSet.get_queryset
+            completed_lessons = getattr(obj, 'completed_lessons', None)
+            if completed_lessons is None:
+                completed_lessons = UserLesson.objects.filter(user=request.user, lesson__course=obj).count()
 
             if total_lessons > 0:
                 return round((completed_lessons / total_lessons) * 100, 2)
@@ -79,19 +87,15 @@ class UserCourseSerializer(serializers.ModelSerializer):
 
 class UserWordInputSerializer(serializers.Serializer):
     word_id = serializers.IntegerField(required=True)
-    level = serializers.IntegerField(required=True, min_value=1, max_value=5)
-    streak = serializers.IntegerField(required=True, min_value=1, max_value=10)
+    # level/streak không còn được dùng: server tự đọc trạng thái từ UserWord
+    level = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    streak = serializers.IntegerField(required=False, min_value=1, max_value=10)
     # is_correct được yêu cầu nếu is_review = true ở cấp cha; để đây tùy chọn:
     is_correct = serializers.BooleanField(required=False)
     question_type = serializers.CharField(required=True)
 
-    def validate_word_id(self, value):
-        if not Word.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Từ với ID này không tồn tại.")
-        return value
 
-
-class UserWordOutputSerializer(serializers.ModelSerializer):
+class UserWordOutputSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     word = WordSerializer()
 
     class Meta:
@@ -111,15 +115,32 @@ class LessonWordsInputSerializer(serializers.Serializer):
             raise serializers.ValidationError({
                 "lesson_id": "Trường này là bắt buộc khi is_review là False."
             })
-        return attrs
 
-    def validate_lesson_id(self, value):
-        if not Lesson.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Lesson với ID này không tồn tại.")
-        return value
+        # Kiểm tra tất cả word_id bằng một truy vấn id__in thay vì một truy vấn cho mỗi từ
+        word_ids = {word_data["word_id"] for word_data in attrs["words"]}
+        word_lessons = dict(Word.objects.filter(id__in=word_ids).values_list("id", "lesson_id"))
+
+        errors = []
+        missing_ids = sorted(word_ids - word_lessons.keys())
+        if missing_ids:
+            errors.append(f"Các từ với ID sau không tồn tại: {missing_ids}")
+        if not is_review:
+            foreign_ids = sorted(word_id for word_id, word_lesson_id in word_lessons.items() if word_lesson_id != lesson_id)
+            if foreign_ids:
+                errors.append(f"Các từ với ID sau không thuộc bài học {lesson_id}: {foreign_ids}")
+        if errors:
+            raise serializers.ValidationError({"words": errors})
+
+        # Khi không ôn tập và đã có từ thuộc lesson_id thì lesson chắc chắn tồn tại
+        if lesson_id is not None and (is_review or not word_lessons):
+            if not Lesson.objects.filter(id=lesson_id).exists():
+                raise serializers.ValidationError({
+                    "lesson_id": "Lesson với ID này không tồn tại."
+                })
+        return attrs
 
 
-class LearnedWordsSerializer(serializers.ModelSerializer):
+class LearnedWordsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     word = WordSerializer()
 
     class Meta:
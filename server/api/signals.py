@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Course, Lesson, UserWord, Word
+from .utils.cache_namespaces import COUNT_WORDS_BY_LEVEL, LEARNED_WORDS, bump_namespaces
+from .utils.catalog_cache import bump_catalog_version
+from .utils.catalog_snapshot import schedule_catalog_snapshot_rebuild
+from .utils.user_word_stats import CEFR_GROUPS, reset_user_word_stats
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=Word)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=Word)
+def invalidate_catalog_cache(sender, **kwargs):
+    """
+    Course / Lesson / Word thay đổi (admin, API) -> sau khi commit, vô hiệu hóa cache catalog
+    và lên lịch build lại snapshot (mỗi thời điểm chỉ một lần build).
+    """
+    transaction.on_commit(catalog_changed)
+
+
+def catalog_changed():
+    bump_catalog_version()
+    schedule_catalog_snapshot_rebuild()
+
+
+@receiver(post_save, sender=UserWord)
+@receiver(post_delete, sender=UserWord)
+def invalidate_user_word_stats(sender, instance, **kwargs):
+    """
+    UserWord thay đổi ngoài submit_words (admin, API, xóa dây chuyền khi xóa Word / user)
+    -> dựng lại bộ đếm UserWordStats và bỏ cache số từ của user.
+    submit_words ghi bằng bulk_create / UPDATE nên không đi qua signal này.
+    """
+    user_id = instance.user_id
+    reset_user_word_stats([user_id])
+    transaction.on_commit(lambda: bump_namespaces(user_id, LEARNED_WORDS, COUNT_WORDS_BY_LEVEL))
+
+
+@receiver(pre_save, sender=Word)
+def remember_word_cefr(sender, instance, update_fields=None, **kwargs):
+    """Ghi nhớ cefr đang lưu trong DB trước khi sửa, để post_save biết cefr có đổi không."""
+    if instance.pk is None or (update_fields is not None and 'cefr' not in update_fields):
+        instance._previous_cefr = instance.cefr
+        return
+    instance._previous_cefr = Word.objects.filter(pk=instance.pk).values_list('cefr', flat=True).first()
+
+
+@receiver(post_save, sender=Word)
+def invalidate_word_user_stats(sender, instance, created, **kwargs):
+    """
+    cefr của Word đổi sang nhóm khác -> dựng lại bộ đếm nhóm CEFR của các user đã học từ này.
+    Sửa các field khác (nghĩa, ví dụ, ảnh...) không ảnh hưởng bộ đếm.
+    """
+    previous = getattr(instance, '_previous_cefr', instance.cefr)
+    if not created and CEFR_GROUPS.get(previous) != CEFR_GROUPS.get(instance.cefr):
+        reset_user_word_stats(UserWord.objects.filter(word=instance).values('user_id'))
@@ -1,3 +1,429 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import CustomUser
+from .models import Course, LeaderBoard, Lesson, UserLesson, UserWord, UserWordStats, Word
+from .serializers import UserWordOutputSerializer, WordSerializer
+from .serializers.fast import fast_serialize
+from .serializers.sparse import parse_sparse_fields, sparse_only
+from .serializers.user_progress import LearnedWordsSerializer
+from .utils.catalog_cache import clear_local_catalog_cache
+from .utils.catalog_snapshot import build_catalog_snapshot, get_snapshot_fragment
+from .utils.user_word_stats import apply_user_word_stats_delta, build_user_word_stats, get_user_word_stats
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN chỉ kiểm tra trên PostgreSQL")
+class QueryPlanTests(TestCase):
+    """
+    Planner phải tự chọn các index của migration 0002 cho các truy vấn nóng
+    trên dữ liệu có số dòng gần với thực tế (không ép enable_seqscan = off).
+    """
+    USERS = 20
+    WORDS = 2000
+    COURSES = 20
+    LESSONS_PER_COURSE = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f"plan{i}", email=f"plan{i}@example.com", verification_token=None)
+            for i in range(cls.USERS)
+        )
+        courses = Course.objects.bulk_create(Course(title=f"Plan {i}") for i in range(cls.COURSES))
+        lessons = Lesson.objects.bulk_create(
+            Lesson(title=f"Plan {i}", course=course)
+            for course in courses
+            for i in range(cls.LESSONS_PER_COURSE)
+        )
+        words = Word.objects.bulk_create(
+            Word(lesson=lessons[i % len(lessons)], word=f"word{i}", meaning="nghĩa") for i in range(cls.WORDS)
+        )
+        now = timezone.now()
+        # Khoảng 5% số từ đã tới hạn ôn, level phân bố đều 1-5; dòng của các user xen kẽ
+        # nhau trên heap như khi nhiều user học cùng lúc
+        UserWord.objects.bulk_create(
+            UserWord(
+                user=user,
+                word=word,
+                level=i % 5 + 1,
+                next_review=now + timedelta(hours=i % 20, minutes=-1),
+            )
+            for i, word in enumerate(words)
+            for user in users
+        )
+        # Mỗi user đã học một nửa số bài học
+        UserLesson.objects.bulk_create(
+            UserLesson(user=user, lesson=lesson)
+            for lesson in lessons[::2]
+            for user in users
+        )
+        LeaderBoard.objects.bulk_create(
+            LeaderBoard(user=user, total_score=i * 7 % 1000) for i, user in enumerate(users * 100)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_userword, api_leaderboard, api_word, api_lesson, api_userlesson")
+        cls.user = users[0]
+        cls.course = courses[0]
+        cls.lesson = lessons[0]
+
+    def assertUsesIndex(self, queryset, index_names, table=None):
+        """
+        index_names: tên index (hoặc tuple các index chấp nhận được) phải xuất hiện trong plan.
+        table: chỉ cấm Seq Scan trên bảng này (bảng nhỏ trong phép join vẫn được quét tuần tự).
+        """
+        plan = queryset.explain()
+        if isinstance(index_names, str):
+            index_names = (index_names,)
+        self.assertTrue(any(name in plan for name in index_names), plan)
+        self.assertNotIn(f"Seq Scan on {table}" if table else "Seq Scan", plan)
+
+    def foreign_key_index(self, model, column):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return next(
+            name for name, constraint in constraints.items()
+            if constraint['index'] and constraint['columns'] == [column]
+        )
+
+    def test_review_window_uses_next_review_index(self):
+        self.assertUsesIndex(
+            UserWord.objects.filter(user=self.user, next_review__lte=timezone.now()),
+            'userword_user_next_review_idx',
+        )
+
+    def test_words_by_level_uses_level_index(self):
+        self.assertUsesIndex(
+            UserWord.objects.filter(user=self.user, level=1).order_by('id')[:10],
+            'userword_user_level_id_idx',
+        )
+
+    def test_lesson_words_use_lesson_index(self):
+        # Index của ForeignKey Word.lesson (tên do Django sinh)
+        self.assertUsesIndex(Word.objects.filter(lesson=self.lesson), self.foreign_key_index(Word, 'lesson_id'))
+
+    def test_course_progress_uses_user_lesson_index(self):
+        # Số bài học đã hoàn thành trong một khóa học (completed_lessons của user-courses):
+        # unique_user_lesson (user, lesson) hoặc index ForeignKey user đều dẫn đầu bằng user_id
+        self.assertUsesIndex(
+            UserLesson.objects.filter(user=self.user, lesson__course=self.course),
+            ('unique_user_lesson', self.foreign_key_index(UserLesson, 'user_id')),
+            table='api_userlesson',
+        )
+
+    def test_leaderboard_page_uses_score_index(self):
+        self.assertUsesIndex(LeaderBoard.objects.order_by('-total_score')[:10], 'leaderboard_total_score_idx')
+
+
+class UserWordStatsTests(TestCase):
+    """Bộ đếm UserWordStats phải khớp với bảng UserWord kể cả khi dữ liệu thay đổi ngoài submit_words."""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("stats", "stats@example.com", "password")
+        cls.lesson = Lesson.objects.create(title="Stats", course=Course.objects.create(title="Stats"))
+        cls.words = [
+            Word.objects.create(lesson=cls.lesson, word=f"word{i}", meaning="nghĩa", cefr=cefr)
+            for i, cefr in enumerate(["A1", "B1", "C1"])
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            "/api/user-words/submit-words/",
+            {"is_review": False, "lesson_id": self.lesson.id, "words": [{"word_id": word.id, "question_type": "L1"} for word in self.words]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_submit_counts_words(self):
+        self.assertEqual(
+            get_user_word_stats(self.user),
+            ({"count_level1": 3}, {"basic": 1, "intermediate": 1, "advanced": 1}),
+        )
+
+    def test_delete_and_cefr_edit_rebuild_counters(self):
+        UserWord.objects.get(user=self.user, word=self.words[0]).delete()
+        self.words[1].cefr = "C2"
+        self.words[1].save()
+        self.assertEqual(
+            get_user_word_stats(self.user),
+            ({"count_level1": 2}, {"basic": 0, "intermediate": 0, "advanced": 2}),
+        )
+
+    def test_word_edit_without_cefr_change_keeps_counters(self):
+        self.words[0].meaning = "nghĩa mới"
+        self.words[0].save()
+        self.words[1].cefr = "B2"  # Cùng nhóm intermediate
+        self.words[1].save()
+        self.assertTrue(UserWordStats.objects.filter(user=self.user).exists())
+
+    def test_rebuild_does_not_overwrite_existing_row(self):
+        # Bản ghi có sẵn (ví dụ vừa được submit_words cộng delta) thắng lần dựng lại dùng GROUP BY cũ hơn
+        UserWordStats.objects.filter(user=self.user).update(count_level1=7)
+        self.assertEqual(build_user_word_stats(self.user).count_level1, 7)
+
+    def test_rebuild_command_fixes_drift(self):
+        UserWordStats.objects.filter(user=self.user).update(count_level1=7, basic=0)
+        call_command("rebuild_user_word_stats", "--user-id", str(self.user.id), stdout=StringIO())
+        self.assertEqual(
+            get_user_word_stats(self.user),
+            ({"count_level1": 3}, {"basic": 1, "intermediate": 1, "advanced": 1}),
+        )
+
+    def test_negative_delta_is_clamped(self):
+        apply_user_word_stats_delta(self.user, {1: -10}, {"basic": -10})
+        stats = UserWordStats.objects.get(user=self.user)
+        self.assertEqual((stats.count_level1, stats.basic), (0, 0))
+
+
+class LessonListQueryCountTests(TestCase):
+    """Danh sách bài học của user chạy số truy vấn cố định, không tăng theo số bài học (không N+1)."""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("lessons", "lessons@example.com", "password")
+        cls.course = Course.objects.create(title="Lessons")
+        lessons = [Lesson.objects.create(title=f"Lesson {i}", course=cls.course) for i in range(5)]
+        for lesson in lessons:
+            Word.objects.bulk_create(Word(lesson=lesson, word=f"word{i}", meaning="nghĩa") for i in range(3))
+        UserLesson.objects.create(user=cls.user, lesson=lessons[0])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_user_lessons(self):
+        # COUNT phân trang + bài học (word_count, is_learned) + prefetch word_set
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/user-lessons/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertEqual(sum(lesson["is_learned"] for lesson in response.data["results"]), 1)
+
+    def test_user_course_lessons(self):
+        # get_object + COUNT phân trang + bài học (word_count, is_learned)
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/user-courses/{self.course.id}/lessons/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertEqual([lesson["word_count"] for lesson in response.data["results"]], [3] * 5)
+
+
+class CatalogLessonQueryCountTests(TestCase):
+    """Danh sách bài học công khai: số truy vấn cố định kể cả khi ?include=words, kết quả luôn có giới hạn."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = Course.objects.create(title="Catalog")
+        lessons = Lesson.objects.bulk_create(Lesson(title=f"Lesson {i}", course=cls.course) for i in range(25))
+        Word.objects.bulk_create(
+            Word(lesson=lesson, word=f"word{i}", meaning="nghĩa") for lesson in lessons for i in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+        clear_local_catalog_cache()
+
+    def test_lessons(self):
+        # COUNT phân trang + bài học (kèm course, word_count)
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/lessons/")
+        self.assertEqual(len(response.data["results"]), 9)
+        self.assertNotIn("words", response.data["results"][0])
+
+    def test_lessons_with_words(self):
+        # ... + prefetch từ của cả trang
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/lessons/?include=words")
+        self.assertEqual([len(lesson["words"]) for lesson in response.data["results"]], [3] * 9)
+
+    def test_course_lessons(self):
+        # Khóa học + COUNT phân trang + bài học
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/courses/{self.course.id}/lessons/")
+        self.assertEqual(len(response.data["results"]), 9)
+        self.assertNotIn("words", response.data["results"][0])
+
+    def test_course_lessons_with_words(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/courses/{self.course.id}/lessons/?include=words")
+        self.assertEqual([len(lesson["words"]) for lesson in response.data["results"]], [3] * 9)
+
+    def test_lesson_lists_are_paginated(self):
+        for url in ("/api/lessons/all_lessons/", f"/api/lessons/lessons_by_course/?course_id={self.course.id}"):
+            with self.subTest(url=url):
+                response = self.client.get(url + ("&" if "?" in url else "?") + "page_size=100")
+                self.assertEqual(response.data["count"], 25)
+                self.assertEqual(len(response.data["results"]), 20)
+
+    def test_top_is_clamped(self):
+        self.assertEqual(len(self.client.get("/api/lessons/top/?n=1000").data), 20)
+        self.assertEqual(self.client.get("/api/lessons/top/?n=0").status_code, 400)
+
+class FastSerializeContractTests(TestCase):
+    """fast_serialize phải cho ra đúng JSON (giá trị và thứ tự field) như serializer DRF tương ứng."""
+    QUERIES = ["", "?fields=word,meaning", "?omit=example,example_vi,image", "?fields=word,image,audio&omit=word"]
+    USER_WORD_QUERIES = QUERIES + [
+        "?fields=level,next_review",
+        "?fields=level,word.word,word.meaning",
+        "?omit=word",
+        "?omit=word.example,word.example_vi,streak",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("contract", "contract@example.com", "password")
+        lesson = Lesson.objects.create(title="Contract", course=Course.objects.create(title="Contract"))
+        words = [
+            Word.objects.create(
+                lesson=lesson, word="apple", pronunciation="/ˈæp.əl/", pos="noun", meaning="quả táo",
+                example="An apple a day.", example_vi="Mỗi ngày một quả táo.", cefr="A1",
+                image="image/upload/v1/apple.jpg", audio="video/upload/v1/apple.mp3",
+            ),
+            Word.objects.create(lesson=lesson, word="ephemeral", meaning="phù du", cefr="C1"),
+        ]
+        now = timezone.now()
+        for i, word in enumerate(words):
+            UserWord.objects.create(user=cls.user, word=word, level=i + 1, streak=i, next_review=now + timedelta(days=i))
+
+    def sparse(self, serializer_class, query):
+        return parse_sparse_fields(Request(APIRequestFactory().get("/" + query)), serializer_class)
+
+    def assertSameOutput(self, serializer_class, queryset, queries):
+        renderer = JSONRenderer()
+        for query in queries:
+            with self.subTest(serializer=serializer_class.__name__, query=query):
+                sparse = self.sparse(serializer_class, query)
+                instances = list(sparse_only(queryset, serializer_class, sparse))
+                expected = serializer_class(instances, many=True, context={'sparse_fields': sparse}).data
+                actual = fast_serialize(serializer_class, instances, sparse)
+                self.assertEqual(actual, expected)
+                self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_word_serializer(self):
+        self.assertSameOutput(WordSerializer, Word.objects.filter(lesson__title="Contract").order_by('id'), self.QUERIES)
+
+    def test_user_word_output_serializer(self):
+        queryset = UserWord.objects.filter(user=self.user).select_related('word').order_by('id')
+        self.assertSameOutput(UserWordOutputSerializer, queryset, self.USER_WORD_QUERIES)
+
+    def test_learned_words_serializer(self):
+        queryset = UserWord.objects.filter(user=self.user).select_related('word').order_by('id')
+        self.assertSameOutput(LearnedWordsSerializer, queryset, self.USER_WORD_QUERIES)
+
+
+class ReviewSessionTests(TestCase):
+    """review-words trả từng batch theo thứ tự trễ tương đối, đi hết phiên qua token "session" không trùng, không sót."""
+    client_class = APIClient
+    DUE = 45
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("review", "review@example.com", "password")
+        lesson = Lesson.objects.create(title="Review", course=Course.objects.create(title="Review"))
+        words = Word.objects.bulk_create(Word(lesson=lesson, word=f"word{i}", meaning="nghĩa") for i in range(cls.DUE + 5))
+        now = timezone.now()
+        UserWord.objects.bulk_create(UserWord(user=cls.user, word=word) for word in words)
+        for i, user_word in enumerate(UserWord.objects.filter(user=cls.user).order_by('id')):
+            # 45 từ đã tới hạn với độ trễ khác nhau (một số trùng độ trễ), 5 từ chưa tới hạn
+            overdue = timedelta(hours=i % 15 + 1) if i < cls.DUE else timedelta(days=-3)
+            UserWord.objects.filter(id=user_word.id).update(
+                next_review=now - overdue, last_review=now - overdue - timedelta(days=1),
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_pages_through_session(self):
+        seen, remaining_values = [], []
+        url = "/api/user-words/review-words/?size=20"
+        while True:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [word["id"] for word in response.data["words"]]
+            remaining_values.append(response.data["remaining"])
+            if response.data["session"] is None:
+                break
+            url = f"/api/user-words/review-words/?size=20&session={response.data['session']}"
+
+        self.assertEqual(remaining_values, [25, 5, 0])
+        self.assertEqual(len(seen), self.DUE)
+        self.assertEqual(len(set(seen)), self.DUE)
+        user_words = {user_word.id: user_word for user_word in UserWord.objects.filter(id__in=seen)}
+        # Cùng khoảng ôn (1 ngày) nên thứ tự ưu tiên là next_review tăng dần, hòa thì theo id
+        self.assertEqual(seen, sorted(seen, key=lambda pk: (user_words[pk].next_review, pk)))
+
+    def test_expired_session(self):
+        response = self.client.get("/api/user-words/review-words/?session=missing")
+        self.assertEqual(response.status_code, 404)
+
+
+class CatalogCacheTests(TestCase):
+    """Các đường đọc catalog có cache phải thấy thay đổi của admin ngay sau khi commit."""
+
+    def setUp(self):
+        cache.clear()
+        # Snapshot riêng cho test: hook on_commit không được build snapshot thật
+        snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(snapshot_dir.cleanup)
+        settings_override = self.settings(CATALOG_SNAPSHOT_PATH=os.path.join(snapshot_dir.name, "catalog_snapshot.bin"))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.course = Course.objects.create(title="Before")
+
+    def test_all_courses_follows_catalog_version(self):
+        self.assertEqual(self.client.get("/api/courses/all_courses/").data["results"][0]["title"], "Before")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.title = "After"
+            self.course.save()
+        self.assertEqual(self.client.get("/api/courses/all_courses/").data["results"][0]["title"], "After")
+
+    def test_cached_page_links_follow_request(self):
+        Course.objects.bulk_create(Course(title=f"Course {i}") for i in range(3))
+        self.client.get("/api/courses/all_courses/?page_size=2&page=1", HTTP_HOST="localhost")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/courses/all_courses/?page=1&page_size=2")
+        self.assertEqual(response.data["next"], "http://testserver/api/courses/all_courses/?page=2&page_size=2")
+        self.assertEqual(response.data["count"], 4)
+
+    def test_catalog_change_schedules_one_snapshot_rebuild(self):
+        lesson = Lesson.objects.create(title="Snapshot", course=self.course)
+        build_catalog_snapshot()
+        with mock.patch("api.utils.catalog_snapshot.subprocess.Popen") as popen:
+            with self.captureOnCommitCallbacks(execute=True):
+                lesson.title = "Snapshot 2"
+                lesson.save()
+                self.course.save()
+            # Snapshot lỗi thời: request đọc qua ORM và không tự khởi chạy build
+            self.assertIsNone(get_snapshot_fragment(f"lesson_words:{lesson.id}"))
+        # Hai thay đổi, một lần build (lần thứ hai bị khóa rebuild chặn)
+        self.assertEqual(popen.call_count, 1)
+        self.assertIn("build_catalog_snapshot", popen.call_args.args[0])
+
+
+class LearnedWordsPaginationTests(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        self.client.force_authenticate(CustomUser.objects.create_user("cursor", "cursor@example.com", "password"))
 
-# Create your tests here.
+    def test_malformed_cursor_is_bad_request(self):
+        for cursor in ("not-a-cursor", "YWJj"):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f"/api/user-words/get-words/?cursor={cursor}")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("cursor", response.data)
@@ -4,6 +4,7 @@ from rest_framework.routers import DefaultRouter
 
 from .views import LessonViewSet, CourseViewSet, UserCourseViewSet, UserLessonViewSet, UserWordViewSet
 from .views.leader_board_views import LeaderBoardViewSet
+from .views.cache_metrics_views import CacheMetricsViewSet
 
 router = DefaultRouter()
 router.register(r'lessons', LessonViewSet)
@@ -12,6 +13,7 @@ router.register(r'user-courses', UserCourseViewSet, basename='user-course')
 router.register(r'user-lessons', UserLessonViewSet, basename='user-lesson') 
 router.register(r'user-words', UserWordViewSet, basename='user-word')
 router.register(r'leaderboard', LeaderBoardViewSet, basename='leaderboard')
+router.register(r'cache-metrics', CacheMetricsViewSet, basename='cache-metrics')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -0,0 +1,16 @@
+from django.db.models import Exists, OuterRef
+
+from api.models import UserLesson
+
+
+def annotate_is_learned(lessons, user):
+    """
+    Thêm cột is_learned = EXISTS(UserLesson của user cho bài học) vào queryset Lesson,
+    để UserLessonSerializer không phải chạy một truy vấn cho mỗi bài học.
+    User chưa đăng nhập: giữ nguyên queryset (serializer trả về False).
+    """
+    if not user.is_authenticated:
+        return lessons
+    return lessons.annotate(
+        is_learned=Exists(UserLesson.objects.filter(user=user, lesson=OuterRef('pk')))
+    )
@@ -0,0 +1,37 @@
+import secrets
+
+from django_redis import get_redis_connection
+
+from api.utils.cache_metrics import cache
+
+# Chỉ xóa khóa nếu giá trị vẫn là token của worker đang giữ (compare-and-delete nguyên tử)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_cache_lock(key, timeout):
+    """
+    Lấy khóa phân tán bằng cache.add (Redis SET NX) với giá trị là một token ngẫu nhiên.
+    :return: token nếu lấy được khóa, None nếu worker khác đang giữ
+    """
+    token = secrets.token_hex(16)
+    return token if cache.add(key, token, timeout=timeout) else None
+
+
+def release_cache_lock(key, token):
+    """
+    Nhả khóa chỉ khi nó vẫn thuộc về token này: nếu khóa đã hết hạn và worker khác
+    vừa lấy lại thì khóa của worker đó được giữ nguyên.
+    """
+    try:
+        redis = get_redis_connection("default")
+    except NotImplementedError:
+        # Cache không phải Redis (dev / test): so sánh rồi xóa, không nguyên tử
+        if cache.get(key) == token:
+            cache.delete(key)
+        return
+    redis.eval(_RELEASE_SCRIPT, 1, cache.make_key(key), cache.client.encode(token))
@@ -0,0 +1,164 @@
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache as django_cache
+from django_redis import get_redis_connection
+
+from api.cache_codec import pop_value_size
+
+logger = logging.getLogger(__name__)
+
+# Các nhóm khóa cache cần theo dõi; khóa không khớp được gom vào "other"
+CACHE_FAMILIES = (
+    "usercourses",
+    "learned_words",
+    "count_words_by_level",
+    "leaderboard_page",
+    "all_courses",
+    "catalog",
+    "cachever",
+    "review_session",
+)
+METRICS_KEY_PREFIX = "cache_metrics"
+FLUSH_INTERVAL = 10.0  # Gộp số liệu của worker vào Redis tối đa mỗi 10 giây
+
+_family_pattern = re.compile(r"^(%s)(?=[:_]|$)" % "|".join(CACHE_FAMILIES))
+_pending = defaultdict(lambda: defaultdict(float))
+_pending_lock = threading.Lock()
+# Dùng khi cache không phải Redis: tổng số liệu chỉ trong worker hiện tại
+_local_totals = defaultdict(lambda: defaultdict(float))
+_last_flush = {'at': time.monotonic()}
+
+
+def cache_family(key):
+    match = _family_pattern.match(str(key))
+    return match.group(1) if match else "other"
+
+
+def _redis():
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _record(family, **values):
+    with _pending_lock:
+        counters = _pending[family]
+        for field, value in values.items():
+            counters[field] += value
+        due = time.monotonic() - _last_flush['at'] >= FLUSH_INTERVAL
+    if due:
+        flush_cache_metrics()
+
+
+def flush_cache_metrics():
+    """Cộng dồn số liệu của worker vào hash Redis cache_metrics:<family> (HINCRBYFLOAT) và ghi log."""
+    with _pending_lock:
+        pending = {family: dict(counters) for family, counters in _pending.items()}
+        _pending.clear()
+        _last_flush['at'] = time.monotonic()
+    if not pending:
+        return
+
+    redis = _redis()
+    if redis is not None:
+        pipe = redis.pipeline(transaction=False)
+        for family, counters in pending.items():
+            for field, value in counters.items():
+                pipe.hincrbyfloat(f"{METRICS_KEY_PREFIX}:{family}", field, value)
+        try:
+            pipe.execute()
+        except Exception:
+            # Không để lỗi ghi số liệu làm hỏng request
+            logger.warning("Không ghi được số liệu cache vào Redis", exc_info=True)
+    else:
+        # Cache không phải Redis: giữ số liệu trong bộ nhớ của worker
+        with _pending_lock:
+            for family, counters in pending.items():
+                for field, value in counters.items():
+                    _local_totals[family][field] += value
+
+    for family, counters in pending.items():
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        logger.info(
+            "cache family=%s hits=%d misses=%d hit_ratio=%.2f sets=%d bytes_read=%d bytes_written=%d "
+            "avg_get_ms=%.2f",
+            family, counters.get("hits", 0), counters.get("misses", 0),
+            counters.get("hits", 0) / lookups if lookups else 0.0,
+            counters.get("sets", 0), counters.get("bytes_read", 0), counters.get("bytes_written", 0),
+            counters.get("get_ms", 0) / lookups if lookups else 0.0,
+        )
+
+
+def get_cache_metrics():
+    """
+    Số liệu cộng dồn của mọi worker theo nhóm khóa, kèm tỉ lệ hit và độ trễ trung bình.
+    :return: dict {family: {hits, misses, sets, bytes_read, bytes_written, hit_ratio, avg_get_ms, avg_set_ms}}
+    """
+    flush_cache_metrics()
+    redis = _redis()
+    totals = {}
+    for family in (*CACHE_FAMILIES, "other"):
+        if redis is not None:
+            raw = redis.hgetall(f"{METRICS_KEY_PREFIX}:{family}")
+            counters = {field.decode(): float(value) for field, value in raw.items()}
+        else:
+            counters = dict(_local_totals.get(family, {}))
+        if not counters:
+            continue
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        sets = counters.get("sets", 0)
+        totals[family] = {
+            **{field: round(counters.get(field, 0)) for field in ("hits", "misses", "sets", "bytes_read", "bytes_written")},
+            "hit_ratio": round(counters.get("hits", 0) / lookups, 4) if lookups else None,
+            "avg_get_ms": round(counters.get("get_ms", 0) / lookups, 3) if lookups else None,
+            "avg_set_ms": round(counters.get("set_ms", 0) / sets, 3) if sets else None,
+        }
+    return totals
+
+
+class InstrumentedCache:
+    """
+    Bọc django.core.cache.cache, đếm hit/miss của get, số byte (kích thước đã mã hóa do
+    api.cache_codec ghi nhận) và độ trễ get/set theo nhóm khóa. Các phương thức khác
+    (add cho khóa/version, delete, incr, ...) được chuyển thẳng.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def get(self, key, default=None, version=None):
+        pop_value_size()
+        started = time.perf_counter()
+        value = self._backend.get(key, default, version=version)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        hit = value is not default
+        _record(
+            cache_family(key),
+            hits=int(hit), misses=int(not hit),
+            bytes_read=pop_value_size() if hit else 0,
+            get_ms=elapsed_ms,
+        )
+        return value
+
+    def set(self, key, value, *args, **kwargs):
+        pop_value_size()
+        started = time.perf_counter()
+        result = self._backend.set(key, value, *args, **kwargs)
+        _record(
+            cache_family(key),
+            sets=1,
+            bytes_written=pop_value_size(),
+            set_ms=(time.perf_counter() - started) * 1000,
+        )
+        return result
+
+
+cache = InstrumentedCache(django_cache)
@@ -0,0 +1,49 @@
+import time
+
+from api.utils.cache_metrics import cache
+
+# Các nhóm cache theo user, mỗi nhóm có một bộ đếm thế hệ (generation) riêng
+USER_COURSES = "usercourses"
+LEARNED_WORDS = "learned_words"
+COUNT_WORDS_BY_LEVEL = "count_words_by_level"
+
+
+def _version_key(family, user_id):
+    return f"cachever:{family}:{user_id}"
+
+
+def get_namespace_version(family, user_id):
+    """
+    Trả về thế hệ hiện tại của nhóm cache family cho user.
+    Thế hệ được khởi tạo bằng mốc thời gian (ms) để nếu khóa version bị evict,
+    thế hệ mới không trùng với các entry cũ còn sót lại.
+    """
+    key = _version_key(family, user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def namespaced_key(family, user_id, *parts):
+    """
+    Tạo khóa cache gắn với thế hệ hiện tại của nhóm, ví dụ
+    namespaced_key(USER_COURSES, 5, "/api/user-courses/?page=2")
+    -> "usercourses:5:1718000000000:/api/user-courses/?page=2"
+    """
+    version = get_namespace_version(family, user_id)
+    return ":".join([family, str(user_id), str(version), *(str(part) for part in parts)])
+
+
+def bump_namespaces(user_id, *families):
+    """
+    Vô hiệu hóa toàn bộ cache của các nhóm cho user bằng một lệnh INCR mỗi nhóm,
+    thay vì quét keyspace bằng KEYS/SCAN. Các entry cũ không còn được đọc và tự hết hạn.
+    """
+    for family in families:
+        try:
+            cache.incr(_version_key(family, user_id))
+        except ValueError:
+            # Chưa có version: chưa có entry nào của nhóm này được đọc qua version hiện tại
+            pass
@@ -0,0 +1,113 @@
+import math
+import random
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from rest_framework.response import Response
+
+from api.utils.cache_lock import acquire_cache_lock, release_cache_lock
+from api.utils.cache_metrics import cache
+from api.utils.cache_namespaces import namespaced_key
+from api.utils.catalog_cache import current_catalog_version
+from api.utils.page_payload import page_payload, paginated_response
+
+LOCK_TIMEOUT = 30  # Thời gian tối đa (giây) một worker được giữ khóa dựng lại cache
+# Thời gian tối đa (giây) các worker khác chờ bản cache đầu tiên khi chưa có bản cũ;
+# giữ ngắn vì worker sync bị chặn trong lúc chờ, quá hạn thì tự tính
+LOCK_WAIT = 0.25
+LOCK_POLL_INTERVAL = 0.025
+
+
+def _normalized_request_key(request):
+    """Đường dẫn + query params đã sắp xếp (bỏ tham số rỗng) để ?page=2&page_size=9 và ?page_size=9&page=2 dùng chung khóa."""
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    return f"{request.path}?{urlencode(params)}" if params else request.path
+
+
+def _should_refresh_early(entry, beta):
+    """
+    Làm mới sớm theo xác suất (XFetch): entry càng gần hết hạn và càng tốn thời gian
+    dựng lại thì càng có khả năng được một request làm mới trước khi hết hạn.
+    """
+    return time.time() - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expires_at']
+
+
+def _is_paginated(view, response):
+    """Response là một trang của paginator của view (paginate_queryset đã chạy cho request này)."""
+    return isinstance(response.data, dict) and getattr(view.paginator, 'page', None) is not None
+
+
+def _cached_response(view, request, entry):
+    if 'page' in entry:
+        return paginated_response(view.paginator, request, entry['page'])
+    return Response(entry['data'])
+
+
+def cache_response(prefix, timeout, per_user=False, catalog=False, beta=1.0):
+    """
+    Decorator cache response của action DRF (chỉ cache response 200).
+
+    - Khóa cache gồm prefix, đường dẫn và query params đã chuẩn hóa, nên mỗi trang /
+      page_size có entry riêng. per_user=True dùng namespaced_key(prefix, user.id, ...)
+      để submit_words có thể vô hiệu hóa bằng bump_namespaces. catalog=True gắn khóa với
+      phiên bản catalog (current_catalog_version) để admin sửa Course / Lesson / Word là
+      entry cũ hết hiệu lực ngay, như các đường đọc catalog khác.
+    - Single-flight: chỉ worker lấy được khóa "<key>:lock" (cache.add = Redis SET NX)
+      mới dựng lại entry; các worker khác trả bản cũ nếu có, nếu không thì chờ bản đầu tiên
+      tối đa LOCK_WAIT rồi tự tính. Khóa mang token của worker giữ nó và chỉ được nhả
+      bởi chính worker đó.
+    - Response phân trang chỉ cache dữ liệu trang (page_payload); link next / previous được
+      dựng lại theo host và query string của từng request.
+    - Làm mới sớm theo xác suất để entry nóng được dựng lại trước khi hết hạn.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            request_key = _normalized_request_key(request)
+            if per_user:
+                key = namespaced_key(prefix, request.user.id, request_key)
+            elif catalog:
+                key = f"{prefix}:{current_catalog_version()}:{request_key}"
+            else:
+                key = f"{prefix}:{request_key}"
+
+            entry = cache.get(key)
+            if entry is not None and not _should_refresh_early(entry, beta):
+                return _cached_response(self, request, entry)
+
+            lock_key = f"{key}:lock"
+            lock_token = acquire_cache_lock(lock_key, LOCK_TIMEOUT)
+            if lock_token is not None:
+                try:
+                    started = time.monotonic()
+                    response = view_method(self, request, *args, **kwargs)
+                    if response.status_code == 200:
+                        if _is_paginated(self, response):
+                            entry = {'page': page_payload(self.paginator, response.data['results'])}
+                        else:
+                            entry = {'data': response.data}
+                        entry.update(delta=time.monotonic() - started, expires_at=time.time() + timeout)
+                        cache.set(key, entry, timeout=timeout)
+                    return response
+                finally:
+                    release_cache_lock(lock_key, lock_token)
+
+            # Một worker khác đang dựng lại entry
+            if entry is not None:
+                return _cached_response(self, request, entry)
+            deadline = time.monotonic() + LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+                entry = cache.get(key)
+                if entry is not None:
+                    return _cached_response(self, request, entry)
+            # Hết thời gian chờ: tự tính, không ghi cache
+            return view_method(self, request, *args, **kwargs)
+        return wrapper
+    return decorator
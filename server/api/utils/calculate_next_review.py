@@ -1,4 +1,4 @@
-from random import randint
+from random import Random
 from django.utils import timezone
 from datetime import timedelta
 
@@ -12,6 +12,18 @@ question_type_times = {
     "L5": 1.5,
 }
 
+# Bảng tra timedelta theo (level, streak, question_type) và theo số phút ngẫu nhiên,
+# tính sẵn một lần để batch không phải tạo timedelta mới cho từng từ
+_review_deltas = {
+    (level, streak, question_type): timedelta(hours=streak * question_type_time * level_time[level - 1])
+    for level in range(1, len(level_time) + 1)
+    for streak in range(1, 11)
+    for question_type, question_type_time in question_type_times.items()
+}
+_minute_deltas = [timedelta(minutes=minutes) for minutes in range(60)]
+_minute_offsets = range(60)
+_default_rng = Random()
+
 def calculate_next_review(level, streak, question_type):
     """
     Tính toán thời gian ôn tập tiếp theo dựa trên level, streak và question_type,
@@ -22,13 +34,47 @@ def calculate_next_review(level, streak, question_type):
     :param question_type: str, ví dụ "L1", "L2", ...
     :return: datetime, thời điểm next_review
     """
-    # Tính số giờ cơ bản
-    base_hours = streak * question_type_times[question_type] * level_time[level - 1]
-    # Tạo offset ngẫu nhiên theo phút (ví dụ từ 0 đến 59 phút)
-    rand_minutes = randint(0, 59)
-    # Tính toán next_review bằng cách cộng thêm base_hours và rand_minutes
-    next_review = timezone.now() + timedelta(hours=base_hours, minutes=rand_minutes)
-    return next_review
+    return calculate_next_reviews([level], [streak], [question_type])[0]
+
+def random_review_minutes(count, rng=None):
+    """
+    Sinh count offset ngẫu nhiên theo phút (từ 0 đến 59) trong một lần gọi.
+
+    :param count: int, số offset cần sinh
+    :param rng: random.Random hoặc seed (int), để kết quả lặp lại được khi test
+    :return: list[int]
+    """
+    if rng is None:
+        rng = _default_rng
+    elif not isinstance(rng, Random):
+        rng = Random(rng)
+    return rng.choices(_minute_offsets, k=count)
+
+def calculate_next_reviews(levels, streaks, question_types, now=None, rng=None):
+    """
+    Phiên bản batch của calculate_next_review: dùng chung một mốc "now" và một
+    bộ sinh số ngẫu nhiên cho cả batch thay vì gọi timezone.now()/randint cho từng từ.
+
+    :param levels: list[int], level của từng từ
+    :param streaks: list[int], streak của từng từ
+    :param question_types: list[str], question_type của từng từ
+    :param now: datetime, mốc thời gian chung (mặc định timezone.now())
+    :param rng: random.Random hoặc seed (int), để kết quả lặp lại được khi test
+    :return: list[datetime], next_review theo đúng thứ tự đầu vào
+    """
+    if now is None:
+        now = timezone.now()
+    minutes = random_review_minutes(len(levels), rng)
+    return [
+        now + _review_delta(level, streak, question_type) + _minute_deltas[rand_minutes]
+        for level, streak, question_type, rand_minutes in zip(levels, streaks, question_types, minutes)
+    ]
+
+def _review_delta(level, streak, question_type):
+    delta = _review_deltas.get((level, streak, question_type))
+    if delta is None:
+        delta = timedelta(hours=streak * question_type_times[question_type] * level_time[level - 1])
+    return delta
 
 def calculate_time_until_next_review(cutoff_time):
     """
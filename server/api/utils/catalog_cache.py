@@ -0,0 +1,96 @@
+import pickle
+import threading
+import time
+
+from cachetools import TTLCache
+
+from api.utils.cache_metrics import cache
+
+# Course / Lesson / Word gần như tĩnh: đọc qua hai tầng cache
+#   1. TTLCache trong bộ nhớ của từng worker (LRU, giới hạn theo số byte)
+#   2. Redis, khóa gắn với phiên bản catalog hiện tại
+# Khi admin sửa dữ liệu, api.signals tăng CATALOG_VERSION_KEY (INCR); mỗi worker
+# kiểm tra lại phiên bản tối đa mỗi VERSION_CHECK_INTERVAL giây và xóa tầng local nếu đổi.
+CATALOG_VERSION_KEY = "catalog_version"
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+LOCAL_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Ngân sách bộ nhớ cho mỗi worker
+LOCAL_CACHE_TTL = 60 * 10
+VERSION_CHECK_INTERVAL = 1.0
+
+_local_cache = TTLCache(maxsize=LOCAL_CACHE_MAX_BYTES, ttl=LOCAL_CACHE_TTL, getsizeof=lambda entry: entry[1])
+_local_lock = threading.Lock()
+_local_version = {'version': None, 'checked_at': 0.0}
+
+
+def get_catalog_version():
+    """
+    Phiên bản catalog hiện tại trong Redis, khởi tạo bằng mốc thời gian (ms)
+    để không trùng với các entry cũ nếu khóa bị evict.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Vô hiệu hóa toàn bộ cache catalog ở mọi worker bằng một lệnh INCR."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Chưa có version: chưa worker nào đọc catalog qua cache
+        pass
+    clear_local_catalog_cache()
+
+
+def clear_local_catalog_cache():
+    with _local_lock:
+        _local_cache.clear()
+        _local_version['version'] = None
+        _local_version['checked_at'] = 0.0
+
+
+def current_catalog_version():
+    """Phiên bản catalog mà worker này đang dùng, đọc lại từ Redis theo chu kỳ."""
+    now = time.monotonic()
+    with _local_lock:
+        if _local_version['version'] is not None and now - _local_version['checked_at'] < VERSION_CHECK_INTERVAL:
+            return _local_version['version']
+
+    version = get_catalog_version()
+    with _local_lock:
+        if version != _local_version['version']:
+            _local_cache.clear()
+            _local_version['version'] = version
+        _local_version['checked_at'] = now
+    return version
+
+
+def get_catalog_data(name, builder, timeout=CATALOG_CACHE_TIMEOUT):
+    """
+    Đọc dữ liệu catalog (đã serialize) qua hai tầng cache, gọi builder() nếu cả hai đều trượt.
+
+    :param name: tên entry, ví dụ "lesson_words:12"
+    :param builder: hàm không tham số trả về dữ liệu có thể pickle (list/dict)
+    :return: dữ liệu đã cache; không được sửa tại chỗ vì được dùng chung giữa các request
+    """
+    version = current_catalog_version()
+    with _local_lock:
+        entry = _local_cache.get(name)
+    if entry is not None:
+        return entry[0]
+
+    key = f"catalog:{version}:{name}"
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, timeout=timeout)
+
+    size = len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    if size <= LOCAL_CACHE_MAX_BYTES:
+        with _local_lock:
+            # Bỏ qua nếu phiên bản vừa đổi trong lúc build
+            if _local_version['version'] == version:
+                _local_cache[name] = (data, size)
+    return data
@@ -0,0 +1,38 @@
+import hashlib
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from api.models import UserLesson
+from api.utils.catalog_cache import current_catalog_version
+
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    ETag mạnh từ phiên bản catalog (tăng sau mọi thêm/sửa/xóa Course, Lesson, Word)
+    và URL đầy đủ. Không dùng Last-Modified: updated_at của Word không tự cập nhật khi sửa
+    và xóa dòng không làm max(updated_at) tăng, nên If-Modified-Since có thể trả 304 sai.
+    """
+    raw = f"{current_catalog_version()}:{request.get_full_path()}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def user_lesson_words_etag(request, pk=None, *args, **kwargs):
+    """ETag cho /user-lessons/<id>/words/: thêm user và trạng thái hoàn thành bài học vì nội dung phụ thuộc vào user."""
+    completed = UserLesson.objects.filter(user=request.user, lesson_id=pk).exists()
+    raw = f"{catalog_etag(request)}:{request.user.pk}:{int(completed)}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+# Trả 304 Not Modified trước khi truy vấn/serialize nếu If-None-Match khớp.
+# Cache-Control: no-cache buộc trình duyệt / proxy hỏi lại (kèm ETag) trước khi dùng bản đã lưu.
+catalog_conditional = method_decorator([
+    cache_control(no_cache=True),
+    condition(etag_func=catalog_etag),
+])
+# Nội dung phụ thuộc user nên proxy dùng chung không được lưu (private)
+user_lesson_conditional = method_decorator([
+    cache_control(private=True, no_cache=True),
+    condition(etag_func=user_lesson_words_etag),
+])
@@ -0,0 +1,171 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
+
+from api.models import Lesson, Word
+from api.renderers import FastJSONRenderer
+from api.serializers import WordSerializer
+from api.utils.cache_lock import acquire_cache_lock, release_cache_lock
+from api.utils.catalog_cache import current_catalog_version, get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# Định dạng file snapshot:
+#   MAGIC (8 byte) | version (uint64) | offset index (uint64) | độ dài index (uint32) | các fragment JSON | index JSON
+# index: {"lesson_words:<id>": [offset, length]}
+# Mỗi fragment là đúng body JSON mà endpoint tương ứng trả về (bản đầy đủ field).
+# Index nằm cuối file để fragment được ghi ngay khi serialize xong, không giữ cả catalog trong bộ nhớ.
+MAGIC = b"EBCSNAP2"
+HEADER = struct.Struct(">8sQQI")
+WORD_CHUNK_SIZE = 2000
+STAT_CHECK_INTERVAL = 1.0
+REBUILD_LOCK_KEY = "catalog_snapshot_rebuild"
+REBUILD_LOCK_TIMEOUT = 60 * 5
+
+_state = {'mmap': None, 'index': {}, 'version': None, 'stat': None, 'checked_at': 0.0}
+_state_lock = threading.Lock()
+
+
+def _snapshot_path():
+    return settings.CATALOG_SNAPSHOT_PATH
+
+
+def _build_fragments():
+    """
+    Serialize danh sách từ của mọi bài học bằng chính serializer của endpoint (Cloudinary URL đã được resolve).
+    Từ được đọc theo (lesson_id, id) bằng .iterator() nên mỗi lúc chỉ giữ từ của một bài học.
+    Danh sách bài học của khóa học được phân trang nên đi qua catalog cache thay vì snapshot.
+    """
+    renderer = FastJSONRenderer()
+    words = Word.objects.filter(lesson__isnull=False).order_by('lesson_id', 'id').iterator(chunk_size=WORD_CHUNK_SIZE)
+    groups = groupby(words, key=attrgetter('lesson_id'))
+    group = next(groups, None)
+
+    for lesson_id in Lesson.objects.order_by('id').values_list('id', flat=True):
+        # Bỏ qua từ của bài học được tạo sau khi đọc danh sách bài học
+        while group is not None and group[0] < lesson_id:
+            group = next(groups, None)
+        lesson_words = []
+        if group is not None and group[0] == lesson_id:
+            lesson_words = list(group[1])
+            group = next(groups, None)
+        yield f"lesson_words:{lesson_id}", renderer.render(WordSerializer(lesson_words, many=True).data)
+
+
+def build_catalog_snapshot(path=None):
+    """
+    Ghi snapshot mới ra file tạm rồi os.replace (nguyên tử), worker đang mmap file cũ
+    vẫn đọc được cho tới khi chuyển sang file mới.
+
+    :return: tuple (version, số fragment, kích thước file)
+    """
+    path = path or _snapshot_path()
+    # Đọc version trước dữ liệu: nếu catalog đổi trong lúc build, snapshot mang version cũ và bị coi là lỗi thời
+    version = get_catalog_version()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".catalog_snapshot.")
+    try:
+        with os.fdopen(fd, "wb") as snapshot:
+            # Header được ghi lại khi đã biết vị trí index
+            snapshot.write(HEADER.pack(MAGIC, version, 0, 0))
+            index = {}
+            offset = HEADER.size
+            for name, body in _build_fragments():
+                snapshot.write(body)
+                index[name] = [offset, len(body)]
+                offset += len(body)
+            index_bytes = json.dumps(index, separators=(",", ":")).encode()
+            snapshot.write(index_bytes)
+            snapshot.seek(0)
+            snapshot.write(HEADER.pack(MAGIC, version, offset, len(index_bytes)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return version, len(index), offset + len(index_bytes)
+
+
+def _load(path):
+    """mmap lại snapshot nếu file đổi (kiểm tra stat tối đa mỗi STAT_CHECK_INTERVAL giây)."""
+    now = time.monotonic()
+    if now - _state['checked_at'] < STAT_CHECK_INTERVAL:
+        return
+    _state['checked_at'] = now
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _state.update(mmap=None, index={}, version=None, stat=None)
+        return
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if signature == _state['stat']:
+        return
+
+    with open(path, "rb") as snapshot:
+        mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, index_offset, index_length = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        # File định dạng cũ: bỏ qua cho tới khi được build lại
+        mapped.close()
+        _state.update(mmap=None, index={}, version=None, stat=signature)
+        return
+    index = json.loads(mapped[index_offset:index_offset + index_length])
+    # mmap cũ tự đóng khi không còn tham chiếu
+    _state.update(mmap=mapped, index=index, version=version, stat=signature)
+
+
+def schedule_catalog_snapshot_rebuild():
+    """
+    Gọi từ hook on_commit khi catalog đổi (api.signals), không gọi trên đường đọc của request.
+    Chỉ một lần build chạy tại một thời điểm (khóa có token): lệnh build_catalog_snapshot chạy
+    trong process riêng nên worker không phải đọc cả bảng Word, và tự build lại nếu catalog
+    tiếp tục đổi trong lúc build. Không làm gì nếu chưa có file snapshot (triển khai không dùng
+    snapshot); file đầu tiên được tạo bởi build_catalog_snapshot khi deploy hoặc cron.
+    """
+    if not os.path.exists(_snapshot_path()):
+        return
+    token = acquire_cache_lock(REBUILD_LOCK_KEY, REBUILD_LOCK_TIMEOUT)
+    if token is None:
+        return
+    command = [
+        sys.executable, os.path.join(settings.BASE_DIR, "manage.py"),
+        "build_catalog_snapshot", "--lock-token", token,
+    ]
+    try:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        release_cache_lock(REBUILD_LOCK_KEY, token)
+        logger.warning("Không khởi chạy được build_catalog_snapshot", exc_info=True)
+
+
+def get_snapshot_fragment(name):
+    """
+    Trả về body JSON (bytes) của entry trong snapshot, hoặc None nếu chưa có snapshot,
+    entry không tồn tại hoặc snapshot lỗi thời so với phiên bản catalog hiện tại
+    (request dùng đường đọc thông thường cho tới khi schedule_catalog_snapshot_rebuild build xong).
+    """
+    with _state_lock:
+        _load(_snapshot_path())
+        mapped, index, version = _state['mmap'], _state['index'], _state['version']
+    if mapped is None or version != current_catalog_version():
+        return None
+    location = index.get(name)
+    if location is None:
+        return None
+    offset, length = location
+    return mapped[offset:offset + length]
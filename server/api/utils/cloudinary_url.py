@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from cloudinary import CloudinaryResource
+from cloudinary.models import CloudinaryField
+
+# Số URL giữ trong bộ nhớ mỗi worker (mỗi entry ~200 byte)
+CLOUDINARY_URL_CACHE_SIZE = 100_000
+
+_field = CloudinaryField()
+
+
+@lru_cache(maxsize=CLOUDINARY_URL_CACHE_SIZE)
+def _delivery_url(value):
+    return _field.parse_cloudinary_resource(value).url
+
+
+def cloudinary_url(resource):
+    """
+    URL delivery của một CloudinaryField, được cache theo giá trị lưu trong DB
+    ("image/upload/v<version>/<public_id>.<format>"), nên mỗi ảnh/âm thanh chỉ dựng URL
+    (cloudinary.utils.cloudinary_url) một lần cho mỗi worker thay vì mỗi dòng mỗi request.
+    Giá trị đổi (upload mới) thì version đổi, nên khóa cache cũng đổi theo.
+    """
+    if not resource:
+        return None
+    if isinstance(resource, CloudinaryResource):
+        return _delivery_url(resource.get_prep_value())
+    return resource.url
+
+
+def clear_cloudinary_url_cache():
+    """Xóa cache URL (khi đổi cấu hình Cloudinary, hoặc để đo hiệu năng)."""
+    _delivery_url.cache_clear()
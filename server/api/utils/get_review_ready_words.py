@@ -1,20 +1,37 @@
-from django.db.models import Min
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
 from api.models import UserWord
 
-def get_review_ready_words(user):
+REVIEW_WINDOW = timedelta(minutes=60)
+
+
+def get_review_ready_words(user, now=None):
     """
-    Trả về tuple (cutoff_time, queryset) với:
-      - cutoff_time = max(min(next_review) + 180 phút, now)
-      - queryset các từ của user có next_review <= cutoff_time
+    Trả về tuple (cutoff_time, review_word_count) chỉ với một truy vấn:
+      - cutoff_time = max(min(next_review) + 60 phút, now)
+      - review_word_count = số từ của user có next_review <= cutoff_time
+    Danh sách từ cần ôn được lấy theo batch qua api.utils.review_session.
+    now: mốc thời gian của người gọi (mặc định timezone.now()) để so sánh cutoff_time với cùng mốc.
     """
-    now = timezone.now()
-    result = UserWord.objects.filter(user=user).aggregate(min_next=Min('next_review'))
-    min_next_review = result.get('min_next')
-    if min_next_review is None:
-        # Trong trường hợp không có từ nào, cutoff_time có thể là now
-        cutoff_time = now
-        return cutoff_time, UserWord.objects.none()
-    cutoff_time = max(min_next_review + timedelta(minutes=60), now)
-    return cutoff_time, UserWord.objects.filter(user=user, next_review__lte=cutoff_time)
\ No newline at end of file
+    now = now or timezone.now()
+    table = UserWord._meta.db_table
+    with connection.cursor() as cursor:
+        # GREATEST bỏ qua NULL nên khi user chưa có từ nào cutoff_time = now, count = 0
+        cursor.execute(
+            f"""
+            WITH bounds AS (
+                SELECT GREATEST(MIN(next_review) + %s, %s) AS cutoff_time
+                FROM {table}
+                WHERE user_id = %s
+            )
+            SELECT bounds.cutoff_time, COUNT(uw.id)
+            FROM bounds
+            LEFT JOIN {table} AS uw
+              ON uw.user_id = %s AND uw.next_review <= bounds.cutoff_time
+            GROUP BY bounds.cutoff_time
+            """,
+            [REVIEW_WINDOW, now, user.pk, user.pk],
+        )
+        cutoff_time, review_word_count = cursor.fetchone()
+    return cutoff_time, review_word_count
@@ -0,0 +1,10 @@
+INCLUDE_PARAM = 'include'
+
+
+def include_words(request):
+    """
+    Request có yêu cầu kèm danh sách từ của mỗi bài học hay không (?include=words).
+    Mặc định các endpoint bài học trả bản rút gọn, không kèm từ.
+    """
+    value = request.query_params.get(INCLUDE_PARAM, '')
+    return 'words' in (part.strip() for part in value.split(','))
@@ -0,0 +1,28 @@
+from django.core.paginator import Paginator
+
+
+def page_payload(paginator, results):
+    """
+    Phần của một trang PageNumberPagination không phụ thuộc request (tổng số, số trang,
+    kích thước trang, results) để đưa vào cache. Link next / previous chứa host và query
+    string của request nên không được cache mà dựng lại bằng paginated_response.
+
+    :param paginator: paginator của view, đã gọi paginate_queryset cho request hiện tại
+    """
+    page = paginator.page
+    return {
+        'count': page.paginator.count,
+        'number': page.number,
+        'per_page': page.paginator.per_page,
+        'results': results,
+    }
+
+
+def paginated_response(paginator, request, payload):
+    """
+    Response phân trang từ payload đã cache, với link next / previous của request hiện tại.
+    Trang được dựng lại trên range(count) nên không chạy truy vấn nào.
+    """
+    paginator.request = request
+    paginator.page = Paginator(range(payload['count']), payload['per_page']).page(payload['number'])
+    return paginator.get_paginated_response(payload['results'])
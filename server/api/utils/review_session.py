@@ -0,0 +1,90 @@
+import secrets
+
+from django.db.models import DurationField, ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import Cast, Extract, Greatest
+from django.utils import timezone
+
+from api.models import UserWord
+from api.utils.cache_metrics import cache
+from api.utils.get_review_ready_words import get_review_ready_words
+
+REVIEW_SESSION_TIMEOUT = 60 * 60  # Phiên ôn tập hết hạn sau 1 giờ
+# Khoảng ôn tối thiểu (giây) khi tính độ trễ tương đối, tránh chia cho 0
+MIN_REVIEW_INTERVAL_SECONDS = 60.0
+
+
+def _session_key(user, token):
+    return f"review_session_{user.id}_{token}"
+
+
+def start_review_session(user):
+    """
+    Mở phiên ôn tập nếu user có từ tới hạn: chỉ đếm số từ trong cửa sổ ôn
+    (get_review_ready_words, một truy vấn qua index), không xếp hạng hay đọc id của cả backlog.
+    Phiên chỉ giữ mốc thời gian, cutoff_time và vị trí keyset của batch trước;
+    nó được ghi vào cache bởi next_review_batch khi còn từ, nên không để lại phiên rỗng.
+
+    :return: tuple (cutoff_time, token, session); token và session là None nếu không có từ nào cần ôn
+             (cutoff_time > now nghĩa là từ sớm nhất chưa tới hạn)
+    """
+    now = timezone.now()
+    cutoff_time, review_word_count = get_review_ready_words(user, now)
+    if not review_word_count or cutoff_time > now:
+        return cutoff_time, None, None
+    session = {'now': now, 'cutoff_time': cutoff_time, 'after': None, 'remaining': review_word_count}
+    return cutoff_time, secrets.token_urlsafe(16), session
+
+
+def _ranked_review_words(user, session, queryset):
+    """
+    Từ trong cửa sổ ôn của phiên, xếp theo mức độ trễ tương đối so với khoảng ôn:
+    (now - next_review) / (next_review - last_review), bắt đầu sau vị trí keyset session['after'].
+    Mốc now cố định theo phiên nên thứ tự không đổi giữa các batch; từ đã ôn xong có
+    next_review mới vượt cutoff_time nên tự rơi khỏi phiên.
+    """
+    overdue = ExpressionWrapper(Value(session['now']) - F('next_review'), output_field=DurationField())
+    interval = ExpressionWrapper(F('next_review') - F('last_review'), output_field=DurationField())
+    ranked = queryset.filter(user=user, next_review__lte=session['cutoff_time']).annotate(
+        # Ép về double precision để giá trị đọc ra so sánh lại chính xác ở batch sau
+        overdue_ratio=Cast(
+            Extract(overdue, 'epoch') / Greatest(Extract(interval, 'epoch'), Value(MIN_REVIEW_INTERVAL_SECONDS)),
+            output_field=FloatField(),
+        ),
+    )
+    if session['after'] is not None:
+        ratio, user_word_id = session['after']
+        ranked = ranked.filter(Q(overdue_ratio__lt=ratio) | Q(overdue_ratio=ratio, id__gt=user_word_id))
+    return ranked.order_by('-overdue_ratio', 'id')
+
+
+def next_review_batch(user, token, size, session=None, queryset=None):
+    """
+    Lấy size từ tiếp theo của phiên ôn tập (một truy vấn ORDER BY ... LIMIT, kèm word)
+    và lưu vị trí keyset cho batch sau.
+
+    :param session: phiên vừa tạo bởi start_review_session, để khỏi đọc lại cache
+    :param queryset: queryset UserWord gốc (ví dụ đã áp .only()), mặc định kèm select_related('word')
+    :return: tuple (list UserWord theo thứ tự ưu tiên, số từ còn lại), hoặc None nếu phiên không tồn tại
+    """
+    key = _session_key(user, token)
+    if session is None:
+        session = cache.get(key)
+        if session is None:
+            return None
+
+    if queryset is None:
+        queryset = UserWord.objects.select_related('word')
+    # Đọc thêm một dòng để biết phiên còn từ hay không
+    user_words = list(_ranked_review_words(user, session, queryset)[:size + 1])
+    batch = user_words[:size]
+
+    remaining = 0
+    if len(user_words) > size:
+        # Số còn lại là ước lượng theo số đếm lúc mở phiên (từ đã ôn ở nơi khác không bị trừ)
+        remaining = max(session['remaining'] - len(batch), 1)
+        last = batch[-1]
+        session.update(after=[last.overdue_ratio, last.id], remaining=remaining)
+        cache.set(key, session, timeout=REVIEW_SESSION_TIMEOUT)
+    else:
+        cache.delete(key)
+    return batch, remaining
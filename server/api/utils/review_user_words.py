@@ -0,0 +1,72 @@
+from django.db import connection
+from django.utils import timezone
+
+from api.models import UserWord
+from api.utils.calculate_next_review import level_time, question_type_times, random_review_minutes
+
+
+def review_user_words(user, words_data, rng=None):
+    """
+    Áp dụng kết quả ôn tập lên các UserWord đã lưu bằng một câu
+    UPDATE ... FROM (VALUES ...), level/streak được đọc từ DB thay vì tin client.
+    Các biểu thức CASE phản ánh đúng calculate_next_review:
+      - trả lời sai: streak = 1, level = max(level - 1, 1)
+      - trả lời đúng (hoặc không gửi is_correct): streak = min(streak + 1, 10),
+        level = min(level + 1, 5), điểm cộng thêm bằng level cũ
+
+    :param user: người dùng đang ôn tập
+    :param words_data: list dict đã validate, gồm word_id, question_type, is_correct
+    :param rng: random.Random hoặc seed (int) cho offset phút ngẫu nhiên
+    :return: tuple (score, list (user_word_id, level cũ, level mới) của các UserWord đã cập nhật)
+    """
+    # Gộp theo word_id (giữ lần xuất hiện cuối), giống submit_words
+    rows = {}
+    for word_data, rand_minutes in zip(words_data, random_review_minutes(len(words_data), rng)):
+        rows[word_data['word_id']] = (
+            word_data['word_id'],
+            word_data.get('is_correct', None) is not False,
+            question_type_times[word_data['question_type']],
+            rand_minutes,
+        )
+    if not rows:
+        return 0, []
+
+    now = timezone.now()
+    table = UserWord._meta.db_table
+    level_hours = ", ".join(str(hours) for hours in level_time)
+    values_sql = ", ".join(["(%s::integer, %s::boolean, %s::double precision, %s::integer)"] * len(rows))
+    sql = f"""
+        UPDATE {table} AS uw
+        SET level = t.new_level,
+            streak = t.new_streak,
+            next_review = %s::timestamptz
+                + t.new_streak * t.type_factor * (ARRAY[{level_hours}]::double precision[])[t.new_level] * INTERVAL '1 hour'
+                + t.rand_minutes * INTERVAL '1 minute',
+            last_review = %s::timestamptz
+        FROM (
+            SELECT prev.id,
+                   prev.level AS old_level,
+                   v.is_correct,
+                   v.type_factor,
+                   v.rand_minutes,
+                   CASE WHEN v.is_correct THEN LEAST(prev.level + 1, 5) ELSE GREATEST(prev.level - 1, 1) END AS new_level,
+                   CASE WHEN v.is_correct THEN LEAST(prev.streak + 1, 10) ELSE 1 END AS new_streak
+            FROM {table} AS prev
+            JOIN (VALUES {values_sql}) AS v(word_id, is_correct, type_factor, rand_minutes)
+              ON prev.word_id = v.word_id
+            WHERE prev.user_id = %s
+        ) AS t
+        WHERE uw.id = t.id
+        RETURNING uw.id, t.old_level, t.new_level, CASE WHEN t.is_correct THEN t.old_level ELSE 0 END AS score
+    """
+    params = [now, now]
+    for row in rows.values():
+        params.extend(row)
+    params.append(user.pk)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        returned = cursor.fetchall()
+
+    score = sum(row[3] for row in returned)
+    return score, [row[:3] for row in returned]
@@ -0,0 +1,28 @@
+from api.renderers import FastJSONRenderer
+
+STREAM_CHUNK_SIZE = 1000
+
+
+def stream_json(queryset, serializer_class, ndjson=False, chunk_size=STREAM_CHUNK_SIZE, context=None):
+    """
+    Generator trả về các mảnh JSON của queryset để dùng với StreamingHttpResponse.
+    Queryset được đọc theo từng chunk bằng .iterator() (server-side cursor trên Postgres)
+    và mỗi dòng được serialize rồi encode ngay, nên bộ nhớ không tăng theo số dòng.
+
+    :param ndjson: True để trả về NDJSON (mỗi dòng một object), False để trả về một mảng JSON
+    """
+    # Dùng lại một serializer cho mọi dòng thay vì khởi tạo serializer mới mỗi dòng
+    serializer = serializer_class(context=context or {})
+    renderer = FastJSONRenderer()
+
+    if ndjson:
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield renderer.render(serializer.to_representation(instance)) + b"\n"
+        return
+
+    yield b"["
+    separator = b""
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield separator + renderer.render(serializer.to_representation(instance))
+        separator = b","
+    yield b"]"
@@ -0,0 +1,125 @@
+from collections import Counter
+
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from api.models import UserWord, UserWordStats
+
+LEVELS = range(1, 6)
+
+# Nhóm CEFR dựa trên trường cefr của Word:
+#   basic: A1, A2
+#   intermediate: B1, B2
+#   advanced: C1, C2
+CEFR_GROUPS = {
+    "A1": "basic",
+    "A2": "basic",
+    "B1": "intermediate",
+    "B2": "intermediate",
+    "C1": "advanced",
+    "C2": "advanced",
+}
+
+
+def build_user_word_stats(user):
+    """
+    Tính lại toàn bộ bộ đếm của user từ bảng UserWord (GROUP BY theo level và cefr)
+    và tạo bản ghi UserWordStats nếu chưa có. Dùng khi user chưa có bản ghi thống kê
+    (hoặc bản ghi đã bị reset_user_word_stats xóa) và trong lệnh rebuild_user_word_stats.
+
+    GROUP BY chạy không khóa nên có thể cũ hơn một submit_words đang chạy song song;
+    vì vậy chỉ INSERT ... ON CONFLICT DO NOTHING, không ghi đè: nếu submit_words
+    (lock_user_word_stats) đã tạo bản ghi và cộng delta thì bản ghi đó được giữ.
+    """
+    rows = UserWord.objects.filter(user=user).values('level', 'word__cefr').annotate(count=Count('id'))
+    level_counts = Counter()
+    cefr_counts = Counter()
+    for row in rows:
+        level_counts[row['level']] += row['count']
+        group = CEFR_GROUPS.get(row['word__cefr'])
+        if group:
+            cefr_counts[group] += row['count']
+
+    values = {f"count_level{level}": level_counts[level] for level in LEVELS}
+    values.update({group: cefr_counts[group] for group in set(CEFR_GROUPS.values())})
+    UserWordStats.objects.bulk_create([UserWordStats(user=user, **values)], ignore_conflicts=True)
+    return UserWordStats.objects.get(user=user)
+
+
+def get_user_word_stats(user):
+    """
+    Đọc bộ đếm của user (một truy vấn), tự dựng lại nếu chưa có.
+    :return: tuple (level_counts, cefr_group_counts) cùng định dạng với count_words_by_level
+    """
+    stats = UserWordStats.objects.filter(user=user).first()
+    if stats is None:
+        stats = build_user_word_stats(user)
+
+    level_counts = {}
+    for level in LEVELS:
+        count = getattr(stats, f"count_level{level}")
+        if count:
+            level_counts[f"count_level{level}"] = count
+    cefr_group_counts = {
+        "basic": stats.basic,
+        "intermediate": stats.intermediate,
+        "advanced": stats.advanced,
+    }
+    return level_counts, cefr_group_counts
+
+
+def count_user_words(user, level=None):
+    """
+    Tổng số từ đã học của user (hoặc của một level) đọc từ bộ đếm, không cần COUNT(*).
+    :param level: level (int hoặc chuỗi từ query param), None để đếm mọi level
+    """
+    level_counts, _ = get_user_word_stats(user)
+    if level is None:
+        return sum(level_counts.values())
+    return level_counts.get(f"count_level{level}", 0)
+
+
+def lock_user_word_stats(user):
+    """
+    Khóa (SELECT ... FOR UPDATE) bản ghi thống kê của user tới hết transaction hiện tại,
+    dựng lại nếu chưa có. Gọi trước khi đọc trạng thái UserWord để tính delta.
+    """
+    stats = UserWordStats.objects.select_for_update().filter(user=user).first()
+    if stats is None:
+        build_user_word_stats(user)
+        stats = UserWordStats.objects.select_for_update().get(user=user)
+    return stats
+
+
+def reset_user_word_stats(user_ids):
+    """
+    Xóa bộ đếm của các user khi UserWord / Word thay đổi ngoài submit_words
+    (admin, API, xóa dây chuyền); lần đọc sau sẽ dựng lại từ bảng UserWord.
+
+    :param user_ids: list id hoặc queryset values('user_id')
+    """
+    UserWordStats.objects.filter(user_id__in=user_ids).delete()
+
+
+def apply_user_word_stats_delta(user, level_deltas, cefr_deltas=None):
+    """
+    Cộng dồn thay đổi vào bộ đếm bằng một câu UPDATE với biểu thức F(), không để bộ đếm âm.
+    Nếu user chưa có bản ghi thống kê thì dựng lại từ bảng UserWord (đã gồm thay đổi vừa ghi).
+
+    :param level_deltas: dict {level: delta}
+    :param cefr_deltas: dict {"basic" | "intermediate" | "advanced": delta}
+    """
+    updates = {
+        f"count_level{level}": Greatest(F(f"count_level{level}") + delta, 0)
+        for level, delta in level_deltas.items() if delta
+    }
+    for group, delta in (cefr_deltas or {}).items():
+        if delta:
+            updates[group] = Greatest(F(group) + delta, 0)
+    if not updates:
+        return
+
+    updates['updated_at'] = timezone.now()
+    if not UserWordStats.objects.filter(user=user).update(**updates):
+        build_user_word_stats(user)
@@ -0,0 +1,16 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..utils.cache_metrics import get_cache_metrics
+
+
+class CacheMetricsViewSet(viewsets.ViewSet):
+    """
+    Số liệu cache theo nhóm khóa (hits, misses, bytes, độ trễ) cộng dồn từ mọi worker.
+    Chỉ dành cho admin, dùng để ước lượng dung lượng Redis và điều chỉnh TTL.
+    """
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response(get_cache_metrics())
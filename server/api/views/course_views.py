@@ -6,7 +6,11 @@ from ..models import Course
 from ..serializers import CourseSerializer, LessonSerializer
 from rest_framework.permissions import AllowAny
 from ..pagination import CustomPagination
-from django.core.cache import cache 
+from ..utils.cache_response import cache_response
+from ..utils.catalog_cache import get_catalog_data
+from ..utils.catalog_conditional import catalog_conditional
+from ..utils.include_words import include_words
+from ..utils.page_payload import page_payload, paginated_response
 
 
 class CourseViewSet(viewsets.ModelViewSet):
@@ -15,36 +19,50 @@ class CourseViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]  
     pagination_class = CustomPagination
 
+    @catalog_conditional
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @catalog_conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=True, methods=['GET'], url_path='lessons')
+    @catalog_conditional
     def get_lessons(self, request, pk=None):
-        course = get_object_or_404(Course, pk=pk)
-        lessons = course.lesson_set.all()
-        serializer = LessonSerializer(lessons, many=True)
-        return Response(serializer.data)
-    
-    def _generate_cache_key(self, request):
-        raw_key = f"usercourses"
-        return raw_key
+        """
+        Danh sách bài học của khóa học, phân trang (?page=, ?page_size=).
+        Mặc định không kèm từ vựng; ?include=words để lấy kèm danh sách từ của mỗi bài.
+        """
+        with_words = include_words(request)
+
+        def build():
+            course = get_object_or_404(Course, pk=pk)
+            lessons = course.lesson_set.order_by('id')
+            if with_words:
+                lessons = lessons.prefetch_related('word_set')
+            page = self.paginate_queryset(lessons)
+            serializer = LessonSerializer(page, many=True, context={'include_words': with_words})
+            return page_payload(self.paginator, serializer.data)
 
+        # Khóa theo giá trị đã chuẩn hóa thay vì URL thô: tham số thừa hoặc page_size vượt
+        # max_page_size không tạo thêm entry trùng nội dung trong catalog cache
+        page_number = request.query_params.get(self.paginator.page_query_param) or 1
+        page_size = self.paginator.get_page_size(request)
+        variant = 'words' if with_words else 'summary'
+        payload = get_catalog_data(f"course_lessons:{pk}:{page_number}:{page_size}:{variant}", build)
+        # Link next / previous dựng lại theo request hiện tại, không lấy từ cache
+        return paginated_response(self.paginator, request, payload)
+    
     @action(detail=False, methods=['GET'], url_path='all_courses')
+    @catalog_conditional
+    @cache_response('all_courses', timeout=60 * 60 * 24, catalog=True)
     def get_all_courses(self, request):
-        cache_key = self._generate_cache_key(request)
-        cached_response = cache.get(cache_key)
-        if cached_response is not None:
-            return Response(cached_response)
-        
         queryset = self.get_queryset()
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            response_data = self.get_paginated_response(serializer.data)
-            cache.set(cache_key, response_data.data, timeout=60 * 60 * 24)
-            return response_data
-        
-        serializer = self.get_serializer(queryset, many=True)
-        response_data = Response(serializer.data)
-        cache.set(cache_key, response_data.data, timeout=60 * 60 * 24)
-        return response_data
-        
-    
+            return self.get_paginated_response(serializer.data)
 
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
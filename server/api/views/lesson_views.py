@@ -1,46 +1,106 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.db.models import Count
 from ..models import Lesson
 from ..serializers import LessonSerializer, WordSerializer, OnlyLessonSerializer
+from ..serializers.fast import fast_serialize
+from ..serializers.sparse import parse_sparse_fields, sparse_only
+from ..pagination import CustomPagination
+from ..utils.catalog_cache import get_catalog_data
+from ..utils.catalog_snapshot import get_snapshot_fragment
+from ..utils.catalog_conditional import catalog_conditional
+from ..utils.include_words import include_words
+
+# Số bài học tối đa của top (bằng kích thước trang tối đa của CustomPagination)
+TOP_LESSONS_MAX = CustomPagination.max_page_size
+
 
 class LessonViewSet(viewsets.ModelViewSet):
     queryset = Lesson.objects.all().select_related('course').annotate(word_count=Count('word')).order_by('id')
     serializer_class = LessonSerializer
+    pagination_class = CustomPagination
+
+    def get_queryset(self):
+        # Mặc định không kèm từ; ?include=words thì lấy từ của cả trang bằng một truy vấn
+        queryset = super().get_queryset()
+        if include_words(self.request):
+            queryset = queryset.prefetch_related('word_set')
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include_words'] = include_words(self.request)
+        return context
+
+    @catalog_conditional
+    def list(self, request, *args, **kwargs):
+        """
+        Danh sách bài học, phân trang (?page=, ?page_size=).
+        Mặc định không kèm từ vựng; ?include=words để lấy kèm danh sách từ của mỗi bài.
+        """
+        return super().list(request, *args, **kwargs)
+
+    @catalog_conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=False, methods=['GET'], url_path='top')
+    @catalog_conditional
     def get_top_n_lessons(self, request):
+        """n bài học đầu tiên (?n=, mặc định 3, tối đa TOP_LESSONS_MAX)."""
         n = request.query_params.get('n', 3)
         try:
             n = int(n)
         except ValueError:
             return Response({"error": "Invalid number format"}, status=400)
+        if n < 1:
+            return Response({"error": "Invalid number format"}, status=400)
 
-        lessons = self.get_queryset()[:n]  
-        serializer = LessonSerializer(lessons, many=True)
+        lessons = self.get_queryset()[:min(n, TOP_LESSONS_MAX)]
+        serializer = self.get_serializer(lessons, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['GET'], url_path='words')
+    @catalog_conditional
     def get_words(self, request, pk=None):
-        lesson = get_object_or_404(Lesson, pk=pk)
-        words = lesson.word_set.all()
-        serializer = WordSerializer(words, many=True)
-        return Response(serializer.data)
+        """
+        Danh sách từ của bài học. Chỉ lấy một số field: ?fields=word,meaning hoặc ?omit=example,example_vi
+        """
+        sparse = parse_sparse_fields(request, WordSerializer)
+        name = f"lesson_words:{pk}"
+        if sparse:
+            name = f"{name}:{sparse.cache_key()}"
+        else:
+            # Snapshot chỉ chứa bản đầy đủ field
+            fragment = get_snapshot_fragment(name)
+            if fragment is not None:
+                return HttpResponse(fragment, content_type='application/json')
+
+        def build():
+            lesson = get_object_or_404(Lesson, pk=pk)
+            return fast_serialize(WordSerializer, sparse_only(lesson.word_set.all(), WordSerializer, sparse), sparse)
+
+        return Response(get_catalog_data(name, build))
     
     @action(detail=False, methods=['GET'], url_path='lessons_by_course')
+    @catalog_conditional
     def get_lessons_by_course(self, request):
+        """Bài học (bản rút gọn) của khóa học ?course_id=, phân trang (?page=, ?page_size=)."""
         course_id = request.query_params.get('course_id')
         if not course_id:
             return Response({"error": "Missing course_id"}, status=400)
         
-        lessons = self.get_queryset().filter(course_id=course_id)  
-        serializer = OnlyLessonSerializer(lessons, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(self.get_queryset().filter(course_id=course_id))
+        serializer = OnlyLessonSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['GET'], url_path='all_lessons')
+    @catalog_conditional
     def get_all_lessons(self, request):
-        lessons = self.get_queryset()  
-        serializer = OnlyLessonSerializer(lessons, many=True)
-        return Response(serializer.data)
+        """Mọi bài học (bản rút gọn), phân trang (?page=, ?page_size=)."""
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = OnlyLessonSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -5,7 +5,11 @@ from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count
 from ..models import Lesson, UserLesson
 from ..serializers import UserLessonSerializer, WordSerializer
+from ..serializers.fast import fast_serialize
+from ..serializers.sparse import parse_sparse_fields, sparse_only
 from ..pagination import CustomPagination
+from ..utils.annotate_is_learned import annotate_is_learned
+from ..utils.catalog_conditional import user_lesson_conditional
 
 @permission_classes([IsAuthenticated])
 class UserLessonViewSet(viewsets.ReadOnlyModelViewSet):
@@ -13,16 +17,21 @@ class UserLessonViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = UserLessonSerializer
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        return annotate_is_learned(super().get_queryset(), self.request.user)
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({"request": self.request})
         return context
     
     @action(detail=True, methods=['get'], url_path='words')
+    @user_lesson_conditional
     def get_words(self, request, pk=None):
         """
         Lấy danh sách từ vựng của bài học cụ thể mà không phân trang.
         URL mẫu: /api/user-lessons/<lesson_id>/words/
+        Chỉ lấy một số field của từ: ?fields=word,meaning hoặc ?omit=example,example_vi
         """
         
         user_lesson = UserLesson.objects.filter(user=request.user, lesson_id=pk).first()
@@ -34,13 +43,12 @@ class UserLessonViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
         lesson = self.get_object()
-        words = lesson.word_set.all()
-        serializer = WordSerializer(words, many=True, context={'request': request})
+        sparse = parse_sparse_fields(request, WordSerializer)
         return Response(
             {
                 'lesson_id': lesson.id,
                 'lesson_title': lesson.title,
                 'lesson_description': lesson.description,
-                'words': serializer.data
+                'words': fast_serialize(WordSerializer, sparse_only(lesson.word_set.all(), WordSerializer, sparse), sparse)
             }
         )
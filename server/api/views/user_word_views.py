@@ -1,18 +1,48 @@
-from django.db.models import Count, Case, When, IntegerField
+from collections import Counter
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.core.cache import cache
+from ..utils.cache_metrics import cache
 from django.utils import timezone
 from ..models import UserWord, UserLesson, UserCourse, LeaderBoard
 from ..pagination import LearnedWordsPagination
 from ..serializers import (
     UserWordInputSerializer, UserWordOutputSerializer, LessonWordsInputSerializer
 )
+from ..serializers.fast import fast_serialize
+from ..serializers.sparse import parse_sparse_fields, sparse_only
 from ..serializers.user_progress import LearnedWordsSerializer
-from ..utils.calculate_next_review import calculate_next_review, calculate_time_until_next_review
+from ..utils.cache_namespaces import (
+    COUNT_WORDS_BY_LEVEL, LEARNED_WORDS, USER_COURSES, bump_namespaces, namespaced_key
+)
+from ..utils.calculate_next_review import calculate_next_reviews, calculate_time_until_next_review
 from ..utils.get_review_ready_words import get_review_ready_words
+from ..utils.review_session import next_review_batch, start_review_session
+from ..utils.review_user_words import review_user_words
+from ..utils.stream_json import stream_json
+from ..utils.user_word_stats import (
+    CEFR_GROUPS, apply_user_word_stats_delta, count_user_words, get_user_word_stats, lock_user_word_stats
+)
+
+# Số từ mặc định / tối đa trả về cho mỗi level ở learned-words
+LEARNED_WORDS_PER_LEVEL = 10
+LEARNED_WORDS_MAX_PER_LEVEL = 50
+
+# Số từ mặc định / tối đa mỗi batch của review-words
+REVIEW_SESSION_SIZE = 20
+REVIEW_SESSION_MAX_SIZE = 100
+
+# Các chế độ streaming của get-words
+STREAM_CONTENT_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
 
 @permission_classes([IsAuthenticated])
 class UserWordViewSet(viewsets.ModelViewSet):
@@ -24,6 +54,7 @@ class UserWordViewSet(viewsets.ModelViewSet):
         return UserWord.objects.filter(user=self.request.user).select_related('word')
 
     @action(detail=False, methods=['post'], url_path='submit-words')
+    @transaction.atomic
     def submit_words(self, request):
         """
         Input:
@@ -33,20 +64,18 @@ class UserWordViewSet(viewsets.ModelViewSet):
             "words": [
                 {
                     "word_id": 123,
-                    "level": 2,
-                    "streak": 3,
                     "is_correct": true,
                     "question_type": "L2"
                 },
                 {
                     "word_id": 124,
-                    "level": 3,
-                    "streak": 2,
                     "is_correct": false,
                     "question_type": "L1"
                 }
             ]
         }
+        level/streak gửi lên (nếu có) bị bỏ qua: khi ôn tập, trạng thái mới
+        được tính từ UserWord đã lưu.
         """
         parent_serializer = LessonWordsInputSerializer(data=request.data)
         parent_serializer.is_valid(raise_exception=True)
@@ -57,52 +86,74 @@ class UserWordViewSet(viewsets.ModelViewSet):
         words_data = validated_data['words']
         user = request.user
 
-        processed_words = []
-        update_list = []
-        score = 0
-        for word_data in words_data:
-            word_id = word_data['word_id']
-            question_type = word_data['question_type']
-            is_correct = word_data.get('is_correct', None)
-
-            if not is_review:
-                # Nếu không phải ôn, reset level và streak
-                score += 1
-                new_level = 1
-                new_streak = 1
-            else:
-                level = word_data['level']
-                streak = word_data['streak']
-                if is_correct is False:
-                    new_streak = 1
-                    new_level = max(level - 1, 1)
-                else:
-                    score += level
-                    new_streak = min(10, streak + 1)
-                    new_level = min(level + 1, 5)
+        # Khóa bộ đếm của user trước khi đọc trạng thái UserWord: các submit đồng thời
+        # của cùng user được xếp hàng nên không đếm trùng một từ
+        lock_user_word_stats(user)
 
-            next_review_value = calculate_next_review(new_level, new_streak, question_type)
-            # Tìm hoặc tạo đối tượng UserWord
-            user_word, created = UserWord.objects.get_or_create(    
-                user=user,
-                word_id=word_id,
-                defaults={
-                    'level': new_level,
-                    'streak': new_streak,
-                    'next_review': next_review_value,
-                }
+        # Thay đổi số từ theo level / nhóm CEFR để cập nhật UserWordStats
+        level_deltas = Counter()
+        cefr_deltas = Counter()
+        if is_review:
+            # Ôn tập: level/streak mới được tính trong SQL từ trạng thái đã lưu
+            score, transitions = review_user_words(user, words_data)
+            for _, old_level, new_level in transitions:
+                level_deltas[old_level] -= 1
+                level_deltas[new_level] += 1
+            persisted = UserWord.objects.filter(id__in=[user_word_id for user_word_id, _, _ in transitions]).select_related('word')
+            persisted_by_word = {user_word.word_id: user_word for user_word in persisted}
+        else:
+            # Học mới: reset level và streak, mỗi từ được 1 điểm
+            # Gộp theo word_id (giữ lần xuất hiện cuối) vì một câu lệnh
+            # ON CONFLICT DO UPDATE không thể cập nhật cùng một dòng hai lần
+            next_reviews = calculate_next_reviews(
+                [1] * len(words_data),
+                [1] * len(words_data),
+                [word_data['question_type'] for word_data in words_data],
+            )
+            word_states = {}
+            for word_data, next_review in zip(words_data, next_reviews):
+                word_id = word_data['word_id']
+                word_states[word_id] = UserWord(
+                    user=user,
+                    word_id=word_id,
+                    level=1,
+                    streak=1,
+                    next_review=next_review,
+                )
+            score = len(words_data)
+
+            # Level hiện tại của các từ đã học, để tính delta khi reset về level 1
+            previous_levels = dict(
+                UserWord.objects.filter(user=user, word_id__in=word_states.keys()).values_list('word_id', 'level')
             )
-            if not created:
-                # Nếu đã tồn tại thì cập nhật các trường
-                user_word.level = new_level
-                user_word.streak = new_streak
-                user_word.next_review = next_review_value
-                update_list.append(user_word)
-            processed_words.append(user_word)
-
-        # Bulk update cho các đối tượng đã thay đổi
-        if update_list:
-            UserWord.objects.bulk_update(update_list, ['level', 'streak', 'next_review'])
+            # Ghi toàn bộ batch bằng một câu INSERT ... ON CONFLICT (user_id, word_id) DO UPDATE
+            UserWord.objects.bulk_create(
+                word_states.values(),
+                update_conflicts=True,
+                unique_fields=['user', 'word'],
+                update_fields=['level', 'streak', 'next_review', 'last_review'],
+            )
+            # Đọc lại các dòng đã lưu (một truy vấn) để trả về learned_at/id đúng như trong DB
+            persisted = UserWord.objects.filter(user=user, word_id__in=word_states.keys()).select_related('word')
+            persisted_by_word = {user_word.word_id: user_word for user_word in persisted}
+            for word_id, user_word in persisted_by_word.items():
+                previous_level = previous_levels.get(word_id)
+                if previous_level is None:
+                    group = CEFR_GROUPS.get(user_word.word.cefr)
+                    if group:
+                        cefr_deltas[group] += 1
+                else:
+                    level_deltas[previous_level] -= 1
+                level_deltas[1] += 1
+
+        apply_user_word_stats_delta(user, level_deltas, cefr_deltas)
+
+        # Giữ thứ tự gửi lên; từ ôn tập mà user chưa học sẽ bị bỏ qua
+        processed_words = []
+        for word_data in words_data:
+            user_word = persisted_by_word.pop(word_data['word_id'], None)
+            if user_word is not None:
+                processed_words.append(user_word)
 
         # Nếu is_review = false, cần cập nhật trạng thái cho UserLesson
         if not is_review and lesson_id is not None:
@@ -140,60 +191,66 @@ class UserWordViewSet(viewsets.ModelViewSet):
             "words": output_serializer.data,
         }
 
+        # Tăng thế hệ cache của user sau khi commit; chỉ khi học mới thì tiến độ khóa học mới thay đổi
+        families = [LEARNED_WORDS, COUNT_WORDS_BY_LEVEL]
         if not is_review:
-            pattern = f"usercourses:{user.id}:*"
-            # Xóa cache cho tất cả các khóa học của user
-            cache.delete_pattern(pattern) if hasattr(cache, 'delete_pattern') else cache.delete_many(cache.keys(pattern))
-
-        cache.delete(f"count_words_by_level_{user.id}")
-        cache.delete(f"learned_words_{user.id}")
+            families.append(USER_COURSES)
+        transaction.on_commit(lambda: bump_namespaces(user.id, *families))
 
         return Response(response_data, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'], url_path='get-words')
     def get_words(self, request):
+        """
+        Danh sách từ đã học, phân trang keyset theo (level, id): mặc định 20 từ mỗi trang
+        (?page_size= tối đa 100), response {"count", "next", "results"}, đi tiếp theo link "next".
+        URL mẫu: /api/user-words/get-words/?page_size=50&cursor=<next>
+
+        Xuất toàn bộ từ không phân trang bằng streaming:
+        ?stream=json (một mảng JSON) hoặc ?stream=ndjson (mỗi dòng một object).
+
+        Chỉ lấy một số field: ?fields=level,word.word,word.meaning hoặc ?omit=user,word.example
+        """
+        sparse = parse_sparse_fields(request, UserWordOutputSerializer)
+        # level luôn được đọc vì là khóa phân trang / sắp xếp
+        queryset = sparse_only(self.get_queryset(), UserWordOutputSerializer, sparse, extra_columns=('level',))
+        context = {'request': request, 'sparse_fields': sparse}
+        stream = request.query_params.get('stream')
+        if stream in STREAM_CONTENT_TYPES:
+            chunks = stream_json(
+                queryset.order_by('level', 'id'),
+                UserWordOutputSerializer,
+                ndjson=stream == 'ndjson',
+                context=context,
+            )
+            return StreamingHttpResponse(chunks, content_type=STREAM_CONTENT_TYPES[stream])
+
         # Sử dụng get_queryset đã tối ưu với select_related
-        words = self.get_queryset()
-        serializer = UserWordOutputSerializer(words, many=True)
-        return Response(serializer.data)
+        paginator = LearnedWordsPagination()
+        words = paginator.paginate_queryset(queryset, request, count=count_user_words(request.user))
+        serializer = UserWordOutputSerializer(words, many=True, context=context)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='count_words-by-level')
     def count_words_by_level(self, request):
         user = request.user
-        cache_key = f"count_words_by_level_{user.id}"
+        cache_key = namespaced_key(COUNT_WORDS_BY_LEVEL, user.id)
         cached_data = cache.get(cache_key)
         if cached_data is not None:
             cached_data['time_until_next_review'] = calculate_time_until_next_review(cached_data['cutoff_time'])
             return Response(cached_data, status=status.HTTP_200_OK)
         
-        queryset = self.get_queryset()
-        cutoff_time, due_words = get_review_ready_words(request.user)
-
+        cutoff_time, review_word_count = get_review_ready_words(request.user)
         time_until_next_review = calculate_time_until_next_review(cutoff_time)
-        # Đếm số từ theo từng level (trường 'level' của UserWord)
-        level_counts = queryset.values('level').annotate(count=Count('id'))
-        
-        # Tính nhóm CEFR dựa trên trường word__cefr của model Word:
-        #   basic: A1, A2
-        #   intermediate: B1, B2
-        #   advanced: C1, C2
-        cefr_group_counts = queryset.aggregate(
-            basic=Count(
-                Case(When(word__cefr__in=["A1", "A2"], then=1), output_field=IntegerField())
-            ),
-            intermediate=Count(
-                Case(When(word__cefr__in=["B1", "B2"], then=1), output_field=IntegerField())
-            ),
-            advanced=Count(
-                Case(When(word__cefr__in=["C1", "C2"], then=1), output_field=IntegerField())
-            )
-        )
-        
+        # Số từ theo level và theo nhóm CEFR (basic/intermediate/advanced) được
+        # đọc từ UserWordStats, không cần GROUP BY toàn bộ UserWord
+        level_counts, cefr_group_counts = get_user_word_stats(user)
+
         result = {
-            "level_counts": {f"count_level{item['level']}": item['count'] for item in level_counts},
+            "level_counts": level_counts,
             "cefr_group_counts": cefr_group_counts,
             "time_until_next_review": time_until_next_review,
-            "review_word_count": due_words.count(),
+            "review_word_count": review_word_count,
             "cutoff_time": cutoff_time,
         }
 
@@ -202,37 +259,52 @@ class UserWordViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='learned-words')
     def learned_words(self, request):
-        cache_key = f"learned_words_{request.user.id}"
+        """
+        Trả về tối đa per_level từ đầu tiên (theo id) của mỗi level cùng số từ theo level.
+        URL mẫu: /api/user-words/learned-words/?per_level=10
+        Chỉ lấy một số field: ?fields=level,word.word,word.meaning hoặc ?omit=word.example,word.example_vi
+        """
+        try:
+            per_level = min(int(request.query_params.get('per_level', LEARNED_WORDS_PER_LEVEL)), LEARNED_WORDS_MAX_PER_LEVEL)
+        except ValueError:
+            return Response({"error": "Invalid number format"}, status=status.HTTP_400_BAD_REQUEST)
+        if per_level < 1:
+            return Response({"error": "Invalid number format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        sparse = parse_sparse_fields(request, LearnedWordsSerializer)
+        cache_key = namespaced_key(LEARNED_WORDS, request.user.id, per_level, sparse.cache_key())
         cached_data = cache.get(cache_key)
         if cached_data is not None:
             cached_data['time_until_next_review'] = calculate_time_until_next_review(cached_data['cutoff_time'])
             return Response(cached_data, status=status.HTTP_200_OK)
         
-        queryset = self.get_queryset()
         # Tính thời gian đến lượt ôn tiếp theo
-        cutoff_time, due_words = get_review_ready_words(request.user)
+        cutoff_time, review_word_count = get_review_ready_words(request.user)
         time_until_next_review = calculate_time_until_next_review(cutoff_time) 
 
-        # Đếm số từ theo từng level (1 đến 5)
-        level_counts_qs = queryset.values('level').annotate(count=Count('id'))
-        level_counts = {f"count_level{item['level']}": item['count'] for item in level_counts_qs}
+        # Một truy vấn duy nhất: ROW_NUMBER() OVER (PARTITION BY level ORDER BY id) để lấy
+        # per_level từ đầu tiên mỗi level, COUNT(*) OVER (PARTITION BY level) để đếm số từ
+        queryset = sparse_only(self.get_queryset(), LearnedWordsSerializer, sparse, extra_columns=('level',))
+        user_words = queryset.annotate(
+            row_number=Window(RowNumber(), partition_by=[F('level')], order_by=F('id').asc()),
+            level_count=Window(Count('id'), partition_by=[F('level')]),
+        ).filter(row_number__lte=per_level).order_by('level', 'id')
+
+        words_by_level = {level: [] for level in range(1, 6)}
+        level_counts = {}
+        for user_word in user_words:
+            words_by_level.setdefault(user_word.level, []).append(user_word)
+            level_counts[f"count_level{user_word.level}"] = user_word.level_count
 
         # Chuẩn bị kết quả trả về, bao gồm thời gian ôn và số từ cần ôn
         result = {
             "time_until_next_review": time_until_next_review,
-            "review_word_count": due_words.count(),
+            "review_word_count": review_word_count,
             "level_counts": level_counts,
             "cutoff_time": cutoff_time,
         }
-        
-        # Với mỗi level, lấy 10 dữ liệu đầu tiên
         for level in range(1, 6):
-            level_qs = queryset.filter(level=level).order_by('id')
-            words = level_qs[:10]
-            serializer = LearnedWordsSerializer(words, many=True, context={'request': request})
-            result[f"words_level{level}"] = serializer.data
-            # Nếu muốn thêm lại số đếm từng level riêng (nếu chưa có trong level_counts)
-            # result[f"count_level{level}"] = level_qs.count()
+            result[f"words_level{level}"] = fast_serialize(LearnedWordsSerializer, words_by_level[level], sparse)
 
         # Lưu vào cache
         cache.set(cache_key, result, timeout=60*15)
@@ -240,25 +312,58 @@ class UserWordViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='review-words')
     def review_words(self, request):
-        # Hàm get_review_ready_words() trả về cutoff_time và danh sách từ cần ôn
-        cutoff_time, due_words = get_review_ready_words(request.user)
-        # nếu cutoff_time > timezone.now() thì không có từ nào cần ôn
-        if cutoff_time > timezone.now():
-            return Response({"message": "No words to review"}, status=status.HTTP_200_OK)
-        serializer = UserWordOutputSerializer(due_words, many=True, context={'request': request})
+        """
+        Trả về tối đa size từ cần ôn, ưu tiên các từ trễ nhiều nhất so với khoảng ôn của chúng.
+        Lần gọi đầu tạo một phiên ôn tập; dùng token "session" trả về để lấy batch tiếp theo.
+        URL mẫu: /api/user-words/review-words/?size=20
+                 /api/user-words/review-words/?session=<token>&size=20
+        Chỉ lấy một số field: ?fields=level,word.word,word.meaning
+        """
+        try:
+            size = min(int(request.query_params.get('size', REVIEW_SESSION_SIZE)), REVIEW_SESSION_MAX_SIZE)
+        except ValueError:
+            return Response({"error": "Invalid number format"}, status=status.HTTP_400_BAD_REQUEST)
+        if size < 1:
+            return Response({"error": "Invalid number format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        token = request.query_params.get('session')
+        session = None
+        if token is None:
+            cutoff_time, token, session = start_review_session(request.user)
+            if token is None:
+                # nếu cutoff_time > timezone.now() thì chưa có từ nào tới hạn ôn
+                if cutoff_time > timezone.now():
+                    return Response({"message": "No words to review"}, status=status.HTTP_200_OK)
+                return Response({"words": [], "session": None, "remaining": 0}, status=status.HTTP_200_OK)
+
+        sparse = parse_sparse_fields(request, UserWordOutputSerializer)
+        queryset = sparse_only(UserWord.objects.select_related('word'), UserWordOutputSerializer, sparse)
+        batch = next_review_batch(request.user, token, size, session=session, queryset=queryset)
+        if batch is None:
+            return Response({"error": "Review session not found or expired"}, status=status.HTTP_404_NOT_FOUND)
+        due_words, remaining = batch
+
         response_data = {
-            "words": serializer.data,
+            "words": fast_serialize(UserWordOutputSerializer, due_words, sparse),
+            "session": token if remaining else None,
+            "remaining": remaining,
         }
         return Response(response_data, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['get'], url_path='learned-words-pagination')
     def learned_words_pagination(self, request):
-        queryset = self.get_queryset()
+        """
+        Từ đã học (có thể lọc ?level=), phân trang keyset như get-words:
+        response {"count", "next", "results"}, đi tiếp theo link "next".
+        URL mẫu: /api/user-words/learned-words-pagination/?level=1&page_size=10
+        """
+        sparse = parse_sparse_fields(request, LearnedWordsSerializer)
+        queryset = sparse_only(self.get_queryset(), LearnedWordsSerializer, sparse, extra_columns=('level',))
         paginator = LearnedWordsPagination()
         level = request.query_params.get('level', None)
         if level is not None:
             queryset = queryset.filter(level=level)
-        paginated_queryset = paginator.paginate_queryset(queryset, request)
-        serializer = LearnedWordsSerializer(paginated_queryset, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginated_queryset = paginator.paginate_queryset(queryset, request, count=count_user_words(request.user, level))
+        serializer = LearnedWordsSerializer(paginated_queryset, many=True, context={'request': request, 'sparse_fields': sparse})
+        return paginator.get_paginated_response(serializer.data)
 
@@ -114,6 +114,17 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+
+    # Encode/decode JSON bằng orjson (tự dùng json chuẩn nếu thiếu orjson)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 MIDDLEWARE = [
@@ -271,6 +282,31 @@ CACHES = {
         "LOCATION": os.getenv("REDIS_URL"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # msgpack + zlib (chỉ nén giá trị > COMPRESS_MIN_LENGTH byte) thay cho pickle,
+            # so sánh bằng `python manage.py benchmark_cache_codec`
+            "SERIALIZER": "api.cache_codec.CompactMsgPackSerializer",
+            "COMPRESSOR": "api.cache_codec.ThresholdZlibCompressor",
+            "COMPRESS_MIN_LENGTH": 1024,
+            "COMPRESS_LEVEL": 6,
         }
     }
-}
\ No newline at end of file
+}
+# Snapshot catalog đã serialize sẵn (build bằng `python manage.py build_catalog_snapshot`),
+# các worker gunicorn mmap cùng một file nên dùng chung page cache của hệ điều hành
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", os.path.join(BASE_DIR, "catalog_snapshot.bin"))
+
+# Ghi log số liệu cache (api.utils.cache_metrics) ra console
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.utils.cache_metrics": {
+            "handlers": ["console"],
+            "level": os.getenv("CACHE_METRICS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}